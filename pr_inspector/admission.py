@@ -0,0 +1,265 @@
+"""Admission control for PR Inspector MCP Server tool calls."""
+
+import itertools
+import math
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from pr_inspector.config import get_admission_config
+
+# Share of capacity each priority class gets relative to the others.
+PRIORITY_WEIGHTS: dict[str, float] = {
+    "interactive": 8.0,
+    "batch": 2.0,
+    "prefetch": 1.0,
+}
+DEFAULT_PRIORITY = "interactive"
+# Cost charged to a flow's virtual time for each admitted request.
+REQUEST_COST = 1.0
+
+
+class ServerBusyError(Exception):
+    """Raised when a request cannot be admitted: the queue is full, the
+    client is over its token quota, or it waited too long for a slot."""
+
+    def __init__(self, message: str, retry_after_seconds: float):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+    def to_result(self) -> str:
+        return f"Server busy: {self} Retry in about {math.ceil(self.retry_after_seconds)}s."
+
+
+@dataclass(order=True)
+class _Waiter:
+    virtual_finish: float
+    sequence: int
+    virtual_start: float = field(compare=False)
+    client_id: str = field(compare=False)
+    priority: str = field(compare=False)
+    admitted: bool = field(default=False, compare=False)
+
+
+@dataclass
+class AdmissionTicket:
+    """An admitted request. Token usage charged to it is billed to its client."""
+    client_id: str
+    priority: str
+    tokens_charged: int = 0
+
+
+class TokenBucket:
+    """Per-client token quota that refills continuously. Requests are
+    charged after the fact, so a client can go into debt and is then
+    refused until the bucket refills above zero. The debt is capped at one
+    bucket's worth, so a single oversized request locks a client out for
+    at most a minute."""
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = tokens_per_minute
+        self.refill_per_second = tokens_per_minute / 60
+        self.tokens = float(tokens_per_minute)
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def seconds_until_available(self) -> float:
+        self._refill()
+        if self.tokens > 0:
+            return 0.0
+        return -self.tokens / self.refill_per_second
+
+    def is_full(self) -> bool:
+        self._refill()
+        return self.tokens >= self.capacity
+
+    def charge(self, tokens: int) -> None:
+        self._refill()
+        self.tokens = max(-self.capacity, self.tokens - tokens)
+
+
+class AdmissionController:
+    """Admits tool calls into a fixed number of execution slots.
+
+    Waiting requests are served by weighted fair queuing: each (client,
+    priority class) pair is a flow whose virtual time advances by
+    REQUEST_COST / weight per admitted request, and the waiter with the
+    smallest virtual finish time goes next. Interactive work therefore gets
+    most of the capacity without starving batch or prefetch work, and one
+    client flooding the queue only delays its own later requests.
+
+    On top of that, each client has a cap on concurrent requests and a
+    token quota, and requests are shed with ServerBusyError when the queue
+    is full or a slot does not free up in time.
+
+    Per-client state is dropped once it no longer affects scheduling: flows
+    whose finish time the virtual clock has passed, and full token buckets
+    of clients with nothing queued or in flight.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_concurrent_per_client: int,
+        max_queue_size: int,
+        max_wait_seconds: float,
+        tokens_per_minute_per_client: int,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_concurrent_per_client = max_concurrent_per_client
+        self.max_queue_size = max_queue_size
+        self.max_wait_seconds = max_wait_seconds
+        self.tokens_per_minute_per_client = tokens_per_minute_per_client
+        self._condition = threading.Condition()
+        self._waiters: list[_Waiter] = []
+        self._in_flight = 0
+        self._in_flight_by_client: dict[str, int] = defaultdict(int)
+        self._flow_finish: dict[tuple[str, str], float] = {}
+        self._virtual_time = 0.0
+        self._token_buckets: dict[str, TokenBucket] = {}
+        self._sequence = itertools.count()
+
+    @contextmanager
+    def admit(self, client_id: str, priority: str = DEFAULT_PRIORITY) -> Iterator[AdmissionTicket]:
+        """
+        Wait for an execution slot and hold it for the duration of the block.
+
+        Args:
+            client_id: Identity the per-client limits and fairness apply to
+            priority: "interactive", "batch" or "prefetch"
+
+        Raises:
+            ServerBusyError: If the request is shed instead of admitted
+            ValueError: If the priority class is unknown
+        """
+        if priority not in PRIORITY_WEIGHTS:
+            raise ValueError(f"Unknown priority '{priority}'. Expected one of: {', '.join(PRIORITY_WEIGHTS)}.")
+        waiter = self._enqueue(client_id, priority)
+        self._wait_for_slot(waiter)
+        ticket = AdmissionTicket(client_id=client_id, priority=priority)
+        token = _current_ticket.set(ticket)
+        try:
+            yield ticket
+        finally:
+            _current_ticket.reset(token)
+            self._release(ticket)
+
+    def _enqueue(self, client_id: str, priority: str) -> _Waiter:
+        with self._condition:
+            bucket = self._token_buckets.setdefault(
+                client_id, TokenBucket(self.tokens_per_minute_per_client)
+            )
+            quota_wait = bucket.seconds_until_available()
+            if quota_wait > 0:
+                raise ServerBusyError(f"Client {client_id} is over its token quota.", quota_wait)
+            if len(self._waiters) >= self.max_queue_size:
+                raise ServerBusyError("The request queue is full.", self.max_wait_seconds)
+            flow = (client_id, priority)
+            # A flow that went idle restarts at the current virtual time, so it
+            # can't bank credit while idle.
+            start = max(self._virtual_time, self._flow_finish.get(flow, 0.0))
+            finish = start + REQUEST_COST / PRIORITY_WEIGHTS[priority]
+            self._flow_finish[flow] = finish
+            waiter = _Waiter(finish, next(self._sequence), start, client_id, priority)
+            self._waiters.append(waiter)
+            self._dispatch()
+            return waiter
+
+    def _wait_for_slot(self, waiter: _Waiter) -> None:
+        deadline = time.monotonic() + self.max_wait_seconds
+        with self._condition:
+            while not waiter.admitted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(waiter)
+                    self._prune()
+                    raise ServerBusyError("Timed out waiting for an execution slot.", self.max_wait_seconds)
+                self._condition.wait(remaining)
+
+    def _dispatch(self) -> None:
+        """Admit eligible waiters in virtual finish order while slots are free.
+        Must be called with the condition held."""
+        admitted_any = False
+        for waiter in sorted(self._waiters):
+            if self._in_flight >= self.max_concurrent:
+                break
+            if self._in_flight_by_client[waiter.client_id] >= self.max_concurrent_per_client:
+                continue
+            self._waiters.remove(waiter)
+            waiter.admitted = True
+            self._in_flight += 1
+            self._in_flight_by_client[waiter.client_id] += 1
+            self._virtual_time = max(self._virtual_time, waiter.virtual_start)
+            admitted_any = True
+        if admitted_any:
+            self._condition.notify_all()
+
+    def _release(self, ticket: AdmissionTicket) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._in_flight_by_client[ticket.client_id] -= 1
+            if self._in_flight_by_client[ticket.client_id] == 0:
+                del self._in_flight_by_client[ticket.client_id]
+            self._token_buckets.setdefault(
+                ticket.client_id, TokenBucket(self.tokens_per_minute_per_client)
+            ).charge(ticket.tokens_charged)
+            self._dispatch()
+            self._prune()
+
+    def _prune(self) -> None:
+        """Drop per-client state that a fresh entry would reproduce. Must be
+        called with the condition held."""
+        if not self._waiters and self._in_flight == 0:
+            # Idle: the next busy period starts after all work served so far.
+            self._virtual_time = max([self._virtual_time, *self._flow_finish.values()])
+        # A flow restarts at max(virtual time, its finish), so once the virtual
+        # time has caught up its entry makes no difference.
+        self._flow_finish = {
+            flow: finish for flow, finish in self._flow_finish.items() if finish > self._virtual_time
+        }
+        active_clients = set(self._in_flight_by_client) | {waiter.client_id for waiter in self._waiters}
+        for client_id in [
+            client_id for client_id, bucket in self._token_buckets.items()
+            if client_id not in active_clients and bucket.is_full()
+        ]:
+            del self._token_buckets[client_id]
+
+
+_current_ticket: ContextVar[AdmissionTicket | None] = ContextVar("admission_ticket", default=None)
+
+
+def charge_tokens(tokens: int) -> None:
+    """Bill token usage to the client of the request currently being handled, if any."""
+    ticket = _current_ticket.get()
+    if ticket is not None:
+        ticket.tokens_charged += tokens
+
+
+# Provider function for dependency injection
+_admission_controller_instance: AdmissionController | None = None
+_admission_controller_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Dependency provider for the admission controller."""
+    global _admission_controller_instance
+    if _admission_controller_instance is None:
+        with _admission_controller_lock:
+            if _admission_controller_instance is None:
+                admission_config = get_admission_config()
+                _admission_controller_instance = AdmissionController(
+                    max_concurrent=admission_config["max_concurrent"],
+                    max_concurrent_per_client=admission_config["max_concurrent_per_client"],
+                    max_queue_size=admission_config["max_queue_size"],
+                    max_wait_seconds=admission_config["max_wait_seconds"],
+                    tokens_per_minute_per_client=admission_config["tokens_per_minute_per_client"],
+                )
+    return _admission_controller_instance
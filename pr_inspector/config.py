@@ -1,13 +1,19 @@
 """Configuration management for PR Inspector MCP Server."""
 
+import functools
+
 import yaml
 from pathlib import Path
 from typing import Any
 
 
+@functools.lru_cache(maxsize=None)
 def load_config(config_path: str = "config.yaml") -> dict[str, Any]:
     """
     Load configuration from a YAML file.
+
+    The file is read once per path and cached for the life of the process,
+    so callers must treat the returned dictionary as read-only.
     
     Args:
         config_path: Path to the configuration YAML file
@@ -50,3 +56,157 @@ def get_server_config(config_path: str = "config.yaml") -> dict[str, Any]:
         "transport": server_config.get("transport", "http"),
     }
 
+
+
+def get_blob_store_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get blob store configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with blob store configuration (path, max_size_mb, context_lines,
+        fetch_concurrency)
+    """
+    config = load_config(config_path)
+    
+    blob_store_config = config.get("blob_store", {})
+    
+    return {
+        "path": blob_store_config.get("path", ".cache/blobs"),
+        "max_size_mb": blob_store_config.get("max_size_mb", 512),
+        "context_lines": blob_store_config.get("context_lines", 5),
+        "fetch_concurrency": blob_store_config.get("fetch_concurrency", 8),
+    }
+
+
+def get_ingestion_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get PR ingestion configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with ingestion configuration (max_request_mb, prompt_context_fraction)
+    """
+    config = load_config(config_path)
+    
+    ingestion_config = config.get("ingestion", {})
+    
+    return {
+        "max_request_mb": ingestion_config.get("max_request_mb", 8),
+        "prompt_context_fraction": ingestion_config.get("prompt_context_fraction", 0.5),
+    }
+
+
+def get_profiling_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get per-request profiling configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with profiling configuration (enabled, mode, output_dir, sample_interval_ms)
+    """
+    config = load_config(config_path)
+    
+    profiling_config = config.get("profiling", {})
+    
+    return {
+        "enabled": profiling_config.get("enabled", False),
+        "mode": profiling_config.get("mode", "deterministic"),
+        "output_dir": profiling_config.get("output_dir", ".cache/profiles"),
+        "sample_interval_ms": profiling_config.get("sample_interval_ms", 5),
+    }
+
+
+def get_repo_profile_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get repository profile configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with repo profile configuration (enabled, digest_max_chars)
+    """
+    config = load_config(config_path)
+    
+    repo_profile_config = config.get("repo_profile", {})
+    
+    return {
+        "enabled": repo_profile_config.get("enabled", True),
+        "digest_max_chars": repo_profile_config.get("digest_max_chars", 2000),
+    }
+
+
+def get_checklist_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get checklist generation configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with checklist configuration (generation_mode,
+        static_analysis_max_chars)
+    """
+    config = load_config(config_path)
+    
+    checklist_config = config.get("checklist", {})
+    
+    return {
+        "generation_mode": checklist_config.get("generation_mode", "single"),
+        "static_analysis_max_chars": checklist_config.get("static_analysis_max_chars", 4000),
+    }
+
+
+def get_llm_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get LLM provider configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with LLM configuration (timeout_seconds, circuit_breaker_failures,
+        circuit_breaker_reset_seconds)
+    """
+    config = load_config(config_path)
+    
+    llm_config = config.get("llm", {})
+    
+    return {
+        "timeout_seconds": llm_config.get("timeout_seconds", 120),
+        "circuit_breaker_failures": llm_config.get("circuit_breaker_failures", 3),
+        "circuit_breaker_reset_seconds": llm_config.get("circuit_breaker_reset_seconds", 60),
+    }
+
+
+def get_admission_config(config_path: str = "config.yaml") -> dict[str, Any]:
+    """
+    Get admission control configuration.
+    
+    Args:
+        config_path: Path to the configuration YAML file
+        
+    Returns:
+        Dictionary with admission configuration (max_concurrent, max_concurrent_per_client,
+        max_queue_size, max_wait_seconds, tokens_per_minute_per_client,
+        client_id_header)
+    """
+    config = load_config(config_path)
+    
+    admission_config = config.get("admission", {})
+    
+    return {
+        "max_concurrent": admission_config.get("max_concurrent", 4),
+        "max_concurrent_per_client": admission_config.get("max_concurrent_per_client", 2),
+        "max_queue_size": admission_config.get("max_queue_size", 16),
+        "max_wait_seconds": admission_config.get("max_wait_seconds", 60),
+        "tokens_per_minute_per_client": admission_config.get("tokens_per_minute_per_client", 200000),
+        "client_id_header": admission_config.get("client_id_header", "x-client-id"),
+    }
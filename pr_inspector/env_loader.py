@@ -8,6 +8,7 @@ load_dotenv(dotenv_path=os.path.join(root_dir, ".env"))
 _env_vars: dict[str, str] = {
     "GITHUB_TOKEN": os.getenv("GITHUB_TOKEN"),
     "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY"),
+    "PR_INSPECTOR_PROFILE": os.getenv("PR_INSPECTOR_PROFILE"),
 }
 
 def load_env_variables(custom_env_vars: dict[str, str] = None) -> dict[str, str]:
@@ -1,4 +1,34 @@
+import fastmcp
 from fastmcp import FastMCP
+from mcp import types
+from mcp.server.subscriptions import InMemorySubscriptionBus, ListenHandler, SubscriptionBus
+
+
+def _register_subscriptions_listen(server: FastMCP, bus: SubscriptionBus) -> None:
+    """
+    Serve `subscriptions/listen` from the given subscription bus.
+
+    FastMCP doesn't serve that method and has no public hook for spec
+    methods (its extension bindings reject them), so the SDK's handler is
+    registered on FastMCP's private low-level server, as the SDK documents
+    for low-level servers. If a FastMCP upgrade moves that server, fail at
+    import time rather than silently dropping subscriptions.
+    """
+    low_level_server = getattr(server, "_mcp_server", None)
+    if not callable(getattr(low_level_server, "add_request_handler", None)):
+        raise RuntimeError(
+            f"FastMCP {fastmcp.__version__} has no low-level server to register "
+            "subscriptions/listen on; update pr_inspector/mcp_instance.py."
+        )
+    low_level_server.add_request_handler(
+        "subscriptions/listen", types.SubscriptionsListenRequestParams, ListenHandler(bus)
+    )
+
 
 # Create the MCP server instance
 mcp = FastMCP("PR Inspector Server")
+
+# Change events (e.g. updated checklists) for clients listening through
+# `subscriptions/listen`.
+subscription_bus = InMemorySubscriptionBus()
+_register_subscriptions_listen(mcp, subscription_bus)
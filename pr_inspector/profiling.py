@@ -0,0 +1,207 @@
+"""Opt-in per-request profiling for PR Inspector MCP Server."""
+
+import cProfile
+import logging
+import pstats
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator
+
+from pr_inspector.config import get_profiling_config
+from pr_inspector.env_loader import fetch_env_variable
+
+logger = logging.getLogger(__name__)
+
+TOP_ALLOCATIONS = 25
+
+# cProfile and tracemalloc are process-wide, so only one request is profiled at a time.
+_profiling_lock = threading.Lock()
+
+
+class StackSampler:
+    """Samples the stacks of every thread at a fixed interval.
+
+    Samples are aggregated in the folded-stack format ("outer;inner count")
+    that flamegraph.pl, speedscope and inferno consume directly, with the
+    thread name as the root frame so worker threads can be told apart.
+    """
+
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self.samples: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own_thread_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, f"thread-{thread_id}"))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def write_folded(self, path: Path) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# The profiler of the request being profiled, if worker threads need their own.
+_active_profiler: "ThreadProfiler | None" = None
+
+
+class ThreadProfiler:
+    """cProfile for the calling thread and for the workers of the executors
+    the request creates, such as the ones sectional mode runs LLM calls on.
+
+    From Python 3.12 cProfile is built on sys.monitoring and already covers
+    every thread. Before that it only covers the thread that enabled it, so
+    request-scoped executors pass `profile_worker_thread` as their
+    initializer to start a profiler in each of their workers, and the stats
+    are merged at the end. Those workers exit with their executor, so no
+    profiler outlives the request; long-lived threads are not profiled.
+    """
+
+    def __init__(self):
+        self._profilers = [cProfile.Profile()]
+        self._lock = threading.Lock()
+        self._per_thread = sys.version_info < (3, 12)
+        self._stopped = False
+
+    def start(self) -> None:
+        global _active_profiler
+        if self._per_thread:
+            _active_profiler = self
+        self._profilers[0].enable()
+
+    def start_in_worker(self) -> None:
+        profiler = cProfile.Profile()
+        with self._lock:
+            if self._stopped:
+                return
+            self._profilers.append(profiler)
+        profiler.enable()
+
+    def stop(self) -> None:
+        global _active_profiler
+        with self._lock:
+            self._stopped = True
+        if _active_profiler is self:
+            _active_profiler = None
+        self._profilers[0].disable()
+
+    def dump_stats(self, path: Path) -> None:
+        with self._lock:
+            profilers = list(self._profilers)
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        stats.dump_stats(path)
+
+
+def profile_worker_thread() -> None:
+    """ThreadPoolExecutor initializer that profiles the worker thread while a
+    request is being profiled. Only pass it to executors that are shut down
+    before the request ends."""
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.start_in_worker()
+
+
+def is_profiling_enabled(debug_profile: bool = False) -> bool:
+    """Profiling is on if requested per call, by config, or by the PR_INSPECTOR_PROFILE env var."""
+    env_value = fetch_env_variable("PR_INSPECTOR_PROFILE") or ""
+    return debug_profile or get_profiling_config()["enabled"] or env_value.lower() in ("1", "true", "yes")
+
+
+@contextmanager
+def profile_request(request_name: str, debug_profile: bool = False) -> Iterator[None]:
+    """
+    Profile the enclosed block if profiling is enabled, otherwise do nothing.
+
+    Writes to the configured output directory:
+    - `<name>.prof` (deterministic mode): cProfile stats, loadable with pstats,
+      snakeviz, or flameprof for a flamegraph
+    - `<name>.folded` (sampling mode): folded stacks for flamegraph tools
+    - `<name>.alloc.txt`: top allocation sites from tracemalloc
+
+    Args:
+        request_name: Human-readable name used in the output file names
+        debug_profile: Force profiling on for this request
+    """
+    if not is_profiling_enabled(debug_profile):
+        yield
+        return
+    if not _profiling_lock.acquire(blocking=False):
+        logger.warning(f"Another request is already being profiled, skipping profiling for {request_name}.")
+        yield
+        return
+
+    profiling_config = get_profiling_config()
+    output_dir = Path(profiling_config["output_dir"])
+    output_dir.mkdir(parents=True, exist_ok=True)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", request_name)
+    output_stem = output_dir / f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{safe_name}"
+
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start()
+    profiler: ThreadProfiler | None = None
+    sampler: StackSampler | None = None
+    if profiling_config["mode"] == "sampling":
+        sampler = StackSampler(profiling_config["sample_interval_ms"])
+        sampler.start()
+    else:
+        profiler = ThreadProfiler()
+        profiler.start()
+    start_time = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start_time
+        try:
+            if sampler is not None:
+                sampler.stop()
+                sampler.write_folded(Path(f"{output_stem}.folded"))
+            if profiler is not None:
+                profiler.stop()
+                profiler.dump_stats(Path(f"{output_stem}.prof"))
+            snapshot = tracemalloc.take_snapshot()
+            _write_allocation_summary(snapshot, Path(f"{output_stem}.alloc.txt"))
+            logger.info(f"Profiled {request_name} in {elapsed:.2f}s, wrote {output_stem}.*")
+        finally:
+            if started_tracemalloc:
+                tracemalloc.stop()
+            _profiling_lock.release()
+
+
+def _write_allocation_summary(snapshot: tracemalloc.Snapshot, path: Path) -> None:
+    current, peak = tracemalloc.get_traced_memory()
+    with open(path, "w") as f:
+        f.write(f"Current traced memory: {current / 1024:.1f} KiB\n")
+        f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n\n")
+        f.write(f"Top {TOP_ALLOCATIONS} allocation sites:\n")
+        for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+            f.write(f"{stat}\n")
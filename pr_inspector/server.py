@@ -5,6 +5,8 @@ from pr_inspector.mcp_instance import mcp
 
 # Import tools to register them with MCP
 from pr_inspector.tools.checklist.tool import create_pr_checklist  # noqa: F401
+# Import resources to register them with MCP
+from pr_inspector.tools.checklist.resources import get_checklist  # noqa: F401
 
 @mcp.tool()
 def say_hello(name: str = "World") -> str:
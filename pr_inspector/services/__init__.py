@@ -1,5 +1,9 @@
 """Services package for PR Inspector MCP Server."""
 
+from pr_inspector.services.blob_store import (
+    BlobStore,
+    get_blob_store,
+)
 from pr_inspector.services.github_service import (
     GithubService,
     PrDetails,
@@ -10,13 +14,23 @@ from pr_inspector.services.llm_service import (
     LLMService,
     get_llm_service,
 )
+from pr_inspector.services.repo_profile_service import (
+    RepoProfile,
+    RepoProfileService,
+    get_repo_profile_service,
+)
 
 __all__ = [
+    "BlobStore",
+    "get_blob_store",
     "GithubService",
     "PrDetails",
     "PrFile",
     "get_github_service",
     "LLMService",
     "get_llm_service",
+    "RepoProfile",
+    "RepoProfileService",
+    "get_repo_profile_service",
 ]
 
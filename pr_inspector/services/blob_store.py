@@ -0,0 +1,154 @@
+"""Local content-addressed store for git blobs."""
+
+import logging
+import mmap
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from pr_inspector.config import get_blob_store_config
+
+logger = logging.getLogger(__name__)
+
+# Once over its cap, the store is evicted down to this fraction of it, so a
+# full store doesn't rescan every blob on each put.
+EVICTION_LOW_WATER_MARK = 0.9
+
+
+class BlobStore:
+    """Size-capped, content-addressed store of git blobs on local disk.
+
+    Blobs are keyed by their git SHA, so a stored blob never goes stale and
+    can be shared across every PR and user that touches the same file
+    version. Reads go through ``mmap`` so only the pages we slice are paged
+    in, and once the store grows past ``max_bytes`` the least recently used
+    blobs are evicted until it is back under the low-water mark.
+    """
+
+    def __init__(self, root_dir: str, max_bytes: int):
+        self.root_dir = Path(root_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.root_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(path.stat().st_size for path in self._iter_blob_paths())
+
+    def _blob_path(self, sha: str) -> Path:
+        # Shard by the first two hex chars like .git/objects to keep directories small.
+        return self.root_dir / sha[:2] / sha[2:]
+
+    def _iter_blob_paths(self):
+        for shard in self.root_dir.iterdir():
+            if shard.is_dir():
+                yield from (path for path in shard.iterdir() if path.is_file())
+
+    def contains(self, sha: str) -> bool:
+        return self._blob_path(sha).exists()
+
+    def put(self, sha: str, data: bytes) -> None:
+        """Store a blob under its SHA. Storing an existing SHA is a no-op."""
+        path = self._blob_path(sha)
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial blob.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        with self._lock:
+            # Another request may have stored the same blob in the meantime;
+            # only the put that creates the file counts its size.
+            if path.exists():
+                os.unlink(tmp_path)
+                return
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data)
+        self._evict_if_needed()
+
+    def read_lines(self, sha: str, start: int, end: int) -> list[str] | None:
+        """
+        Read a range of lines from a stored blob.
+
+        Args:
+            sha: Git blob SHA
+            start: First line to read (1-indexed, inclusive)
+            end: Last line to read (1-indexed, inclusive)
+
+        Returns:
+            The decoded lines without trailing newlines, or None if the blob
+            is not in the store
+        """
+        path = self._blob_path(sha)
+        try:
+            f = open(path, "rb")
+        except FileNotFoundError:
+            return None
+        with f:
+            # Bump mtime so eviction treats the blob as recently used.
+            os.utime(path)
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _slice_lines(mapped, start, end)
+
+    def read_text(self, sha: str) -> str | None:
+        """Read a whole stored blob as text, or None if it is not in the store."""
+        path = self._blob_path(sha)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)
+        return data.decode("utf-8", errors="replace")
+
+    def _evict_if_needed(self) -> None:
+        with self._lock:
+            if self._total_bytes <= self.max_bytes:
+                return
+            target_bytes = self.max_bytes * EVICTION_LOW_WATER_MARK
+            blobs = []
+            for path in self._iter_blob_paths():
+                stat = path.stat()
+                blobs.append((stat.st_mtime, stat.st_size, path))
+            blobs.sort()
+            for _, size, path in blobs:
+                if self._total_bytes <= target_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                self._total_bytes -= size
+                logger.info(f"Evicted blob {path.parent.name}{path.name} from blob store.")
+
+
+def _slice_lines(mapped: mmap.mmap, start: int, end: int) -> list[str]:
+    """Extract lines [start, end] (1-indexed) from a memory-mapped blob."""
+    lines = []
+    line_number = 1
+    offset = 0
+    size = len(mapped)
+    while offset < size and line_number <= end:
+        newline = mapped.find(b"\n", offset)
+        line_end = size if newline == -1 else newline
+        if line_number >= start:
+            lines.append(mapped[offset:line_end].decode("utf-8", errors="replace"))
+        offset = line_end + 1
+        line_number += 1
+    return lines
+
+
+# Provider function for dependency injection
+_blob_store_instance: BlobStore | None = None
+_blob_store_lock = threading.Lock()
+
+
+def get_blob_store() -> BlobStore:
+    """Dependency provider for the blob store."""
+    global _blob_store_instance
+    if _blob_store_instance is None:
+        with _blob_store_lock:
+            if _blob_store_instance is None:
+                blob_store_config = get_blob_store_config()
+                _blob_store_instance = BlobStore(
+                    root_dir=blob_store_config["path"],
+                    max_bytes=blob_store_config["max_size_mb"] * 1024 * 1024,
+                )
+    return _blob_store_instance
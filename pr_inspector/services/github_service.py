@@ -1,25 +1,45 @@
 """Service for interacting with the GitHub API."""
 
+import base64
+import io
 import logging
+import re
 import threading
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TextIO
 
 from github import Github, Auth
 from github.PaginatedList import PaginatedList
 from github.PullRequest import PullRequest
 from github.Repository import Repository
 
+from pr_inspector.config import get_blob_store_config
 from pr_inspector.env_loader import fetch_env_variable
+from pr_inspector.profiling import profile_worker_thread
+from pr_inspector.services.blob_store import BlobStore, get_blob_store
 
 logger = logging.getLogger(__name__)
 
 MAX_DIFF_LENGTH = 1000
+DEFAULT_FETCH_CONCURRENCY = 8
+
+# Matches unified diff hunk headers, e.g. "@@ -10,7 +12,9 @@ def foo():", capturing
+# the old start and length and the new start and length (lengths default to 1).
+HUNK_HEADER_PATTERN = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", re.MULTILINE)
 
 
 @dataclass
 class PrFile:
     file_name: str
-    file_diff: str
+    file_diff: str | None
+    blob_sha: str | None = None  # SHA of the file's blob at the PR head.
+    status: str | None = None  # "added", "modified", "removed", "renamed", ...
+    surrounding_context: list[str] = field(default_factory=list)
+    # Added/removed/modified symbols, rendered in place of the raw diff (and
+    # its surrounding context) when set.
+    symbol_summary: list[str] = field(default_factory=list)
 
 @dataclass
 class PrDetails:
@@ -29,51 +49,127 @@ class PrDetails:
     pr_title: str
     pr_body: str
     pr_files: list[PrFile]
+    head_sha: str | None = None
 
-    def __str__(self) -> str:
-        output = []
-        output.append("=== PR Info ===")
-        output.append(f"Title: {self.pr_title}\n")
-        output.append(f"Body: {self.pr_body.strip() if self.pr_body else ''}\n")
-        output.append("\n=== Files Changed ===")
+    def iter_lines(self, max_chars: int | None = None) -> Iterator[str]:
+        """
+        Lazily render the PR details line by line.
+
+        Args:
+            max_chars: Optional budget on the rendered size. Once exceeded,
+                the remaining files are summarized in a single line instead
+                of being rendered.
+
+        Yields:
+            Lines of the rendered PR details, without trailing newlines
+        """
+        yield "=== PR Info ==="
+        yield f"Title: {self.pr_title}\n"
+        yield f"Body: {self.pr_body.strip() if self.pr_body else ''}\n"
+        yield "\n=== Files Changed ==="
+        rendered_files = 0
+        for _, lines in self._iter_rendered_files(max_chars):
+            rendered_files += 1
+            yield from lines
+        remaining = len(self.pr_files) - rendered_files
+        if remaining:
+            logger.info(f"Prompt budget of {max_chars} characters reached, omitting {remaining} files.")
+            yield f"- ... {remaining} more files omitted to stay within the request budget."
+
+    def files_within_budget(self, max_chars: int | None = None) -> list[PrFile]:
+        """The files `iter_lines` currently renders within `max_chars`."""
+        return [pr_file for pr_file, _ in self._iter_rendered_files(max_chars)]
+
+    def _iter_rendered_files(self, max_chars: int | None) -> Iterator[tuple[PrFile, list[str]]]:
+        """Render files in order until the budget is exceeded. The file that
+        crosses the budget is still rendered in full."""
+        rendered_chars = 0
         for pr_file in self.pr_files:
-            output.append(f"- {pr_file.file_name}:")
-            # TODO: see if we should truncate or not. Currently truncating
-            # for testing urposes, might change later.
-            if pr_file.file_diff is not None:
-                diff_snippet = pr_file.file_diff[:MAX_DIFF_LENGTH]
-                # add ellipsis if truncated
-                if len(pr_file.file_diff) > MAX_DIFF_LENGTH:
-                    logger.info(f"Diff for {pr_file.file_name} was truncated to {MAX_DIFF_LENGTH} characters.")
-                    diff_snippet += " ..."
-                output.append(f"  Diff Start: {diff_snippet}")
-            else:
-                output.append("  (No diff available)")
-        return "\n".join(output)
+            if max_chars is not None and rendered_chars > max_chars:
+                return
+            lines = list(_iter_pr_file_lines(pr_file))
+            rendered_chars += rendered_size(lines)
+            yield pr_file, lines
+
+    def write_to(self, buffer: TextIO, max_chars: int | None = None) -> None:
+        """Stream the rendered PR details into a text buffer."""
+        for line in self.iter_lines(max_chars=max_chars):
+            buffer.write(line)
+            buffer.write("\n")
+
+    def __str__(self) -> str:
+        buffer = io.StringIO()
+        self.write_to(buffer)
+        # Drop the newline written after the last line.
+        return buffer.getvalue()[:-1]
+
+
+def rendered_size(lines: Iterable[str]) -> int:
+    """Size in characters of rendered lines, counting their newlines."""
+    return sum(len(line) + 1 for line in lines)
+
+
+def _iter_pr_file_lines(pr_file: PrFile) -> Iterator[str]:
+    yield f"- {pr_file.file_name}:"
+    if pr_file.symbol_summary:
+        yield "  Symbols Changed:"
+        yield from pr_file.symbol_summary
+        # Context lines are numbered around hunks the summary replaces.
+        return
+    # TODO: see if we should truncate or not. Currently truncating
+    # for testing urposes, might change later.
+    elif pr_file.file_diff is not None:
+        diff_snippet = pr_file.file_diff[:MAX_DIFF_LENGTH]
+        # add ellipsis if truncated
+        if len(pr_file.file_diff) > MAX_DIFF_LENGTH:
+            logger.debug(f"Diff for {pr_file.file_name} was truncated to {MAX_DIFF_LENGTH} characters.")
+            diff_snippet += " ..."
+        yield f"  Diff Start: {diff_snippet}"
+    else:
+        yield "  (No diff available)"
+    if pr_file.surrounding_context:
+        yield "  Surrounding Context:"
+        yield from pr_file.surrounding_context
 
 class GithubService:
     """GitHub service for fetching PR details."""
-    def __init__(self):
+    def __init__(self, blob_store: BlobStore | None = None, fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY):
         self.github_token = fetch_env_variable("GITHUB_TOKEN")
         self.github_client = None
+        self.blob_store = blob_store
+        self.fetch_concurrency = fetch_concurrency
+        self._repos: dict[str, Repository] = {}
 
     def authenticate(self):
         if self.github_client is None:
             self.github_client = Github(auth=Auth.Token(self.github_token))
 
-    def fetch_pr_details(self, pr_link: str):
-        split_pr_link: list[str] = pr_link.split("/")
-        org_name: str = split_pr_link[3]
-        repo_name: str = split_pr_link[4]
-        pr_number: int = int(split_pr_link[-1])
+    def fetch_pull_request(self, pr_link: str) -> PullRequest:
+        """Fetch only the pull request itself (title, body, head SHA), without its files."""
+        org_name, repo_name, pr_number = parse_pr_link(pr_link)
+        return self.get_repo(org_name, repo_name).get_pull(pr_number)
+
+    def fetch_pr_details(
+        self,
+        pr_link: str,
+        max_request_bytes: int | None = None,
+        pull_request: PullRequest | None = None,
+    ):
+        """
+        Fetch a PR and its changed files.
+
+        Every changed file is kept, but once `max_request_bytes` of patches
+        are held the remaining files are kept by name only. So memory grows
+        with the number of changed files, not with the size of their diffs.
+        """
+        org_name, repo_name, pr_number = parse_pr_link(pr_link)
         print(f"""
         Org name: {org_name}, 
         Repo name: {repo_name}, 
         PR number: {pr_number}
         """)
-        repo: Repository = self.github_client.get_repo(f"{org_name}/{repo_name}")
-        pr: PullRequest = repo.get_pull(pr_number)
-        pr_files: list[PrFile] = self.get_pr_files(pr)
+        pr: PullRequest = pull_request or self.fetch_pull_request(pr_link)
+        pr_files: list[PrFile] = list(self.iter_pr_files(pr, max_request_bytes=max_request_bytes))
         return PrDetails(
             org_name=org_name,
             repo_name=repo_name,
@@ -81,17 +177,171 @@ class GithubService:
             pr_title=pr.title,
             pr_body=pr.body,
             pr_files=pr_files,
+            head_sha=pr.head.sha,
         )
 
     def get_pr_files(self, pr: PullRequest) -> list[PrFile]:
         """Given the paginated list of files from the Github API, create the
         internal representation of the files."""
+        return list(self.iter_pr_files(pr))
+
+    def iter_pr_files(self, pr: PullRequest, max_request_bytes: int | None = None) -> Iterator[PrFile]:
+        """
+        Stream the internal representation of the PR's files, one page of the
+        Github API at a time.
+
+        Args:
+            pr: The pull request to fetch files for
+            max_request_bytes: Optional cap on the total size of patches kept
+                in memory. Once reached, the remaining files are still yielded
+                but without their patch, so they show up by name only.
+
+        Yields:
+            PrFile for every file with a patch
+        """
         paginated_files: PaginatedList = pr.get_files()
-        return [
-            PrFile(file_name=file.filename, file_diff=file.patch)
-            for file in paginated_files
-            if file.patch is not None # can happen if file is binary or too large.
+        retained_bytes = 0
+        for file in paginated_files:
+            if file.patch is None: # can happen if file is binary or too large.
+                continue
+            file_diff = file.patch
+            if max_request_bytes is not None:
+                if retained_bytes + len(file_diff) > max_request_bytes:
+                    logger.info(f"Request budget reached, dropping diff for {file.filename}.")
+                    file_diff = None
+                else:
+                    retained_bytes += len(file_diff)
+            yield PrFile(
+                file_name=file.filename,
+                file_diff=file_diff,
+                blob_sha=file.sha,
+                status=file.status,
+            )
+
+    def get_repo(self, org_name: str, repo_name: str) -> Repository:
+        full_name = f"{org_name}/{repo_name}"
+        if full_name not in self._repos:
+            self._repos[full_name] = self.github_client.get_repo(full_name)
+        return self._repos[full_name]
+
+    def fetch_blob(self, org_name: str, repo_name: str, blob_sha: str) -> bool:
+        """Make sure a blob is in the local blob store, fetching it by SHA if
+        needed. Returns False if there is no blob store or the fetch fails."""
+        if self.blob_store is None:
+            return False
+        if self.blob_store.contains(blob_sha):
+            return True
+        try:
+            git_blob = self.get_repo(org_name, repo_name).get_git_blob(blob_sha)
+        except Exception as e:
+            logger.warning(f"Failed to fetch blob {blob_sha}: {e}")
+            return False
+        if git_blob.encoding == "base64":
+            data = base64.b64decode(git_blob.content)
+        else:
+            data = git_blob.content.encode("utf-8")
+        self.blob_store.put(blob_sha, data)
+        return True
+
+    def fetch_blobs(self, org_name: str, repo_name: str, blob_shas: Iterable[str]) -> set[str]:
+        """Make sure several blobs are in the local blob store, fetching the
+        missing ones concurrently (at most `fetch_concurrency` at a time).
+        Returns the SHAs that are available."""
+        if self.blob_store is None:
+            return set()
+        missing = []
+        available = set()
+        for blob_sha in dict.fromkeys(blob_shas):
+            if self.blob_store.contains(blob_sha):
+                available.add(blob_sha)
+            else:
+                missing.append(blob_sha)
+        if not missing:
+            return available
+        # Resolve the repo once up front rather than racing to cache it from every worker.
+        self.get_repo(org_name, repo_name)
+        with ThreadPoolExecutor(
+            max_workers=self.fetch_concurrency, thread_name_prefix="blob-fetch", initializer=profile_worker_thread
+        ) as executor:
+            fetched = executor.map(lambda blob_sha: self.fetch_blob(org_name, repo_name, blob_sha), missing)
+            available.update(blob_sha for blob_sha, ok in zip(missing, fetched) if ok)
+        return available
+
+    def attach_surrounding_context(
+        self, pr_details: PrDetails, context_lines: int, max_chars: int | None = None
+    ) -> None:
+        """Attach up to `context_lines` lines of the head version of each file
+        above and below every diff hunk. File contents are fetched by blob SHA,
+        so each file version is only ever downloaded once. Files with a
+        symbol summary are skipped, since their diff isn't rendered.
+
+        Context is only attached to files rendered within the `max_chars`
+        prompt budget, and only while the rendered files still fit in it with
+        the context added, so it never pushes a file out of the prompt."""
+        if context_lines <= 0:
+            return
+        selected = pr_details.files_within_budget(max_chars)
+        spare_chars = None
+        if max_chars is not None:
+            spare_chars = max_chars - sum(rendered_size(_iter_pr_file_lines(pr_file)) for pr_file in selected)
+            if spare_chars <= 0:
+                return
+        pr_files = [
+            pr_file for pr_file in selected
+            if pr_file.file_diff is not None and pr_file.blob_sha is not None and pr_file.status != "removed"
+            and not pr_file.symbol_summary
         ]
+        available = self.fetch_blobs(
+            pr_details.org_name, pr_details.repo_name, (pr_file.blob_sha for pr_file in pr_files)
+        )
+        for pr_file in pr_files:
+            if pr_file.blob_sha not in available:
+                continue
+            size_before = rendered_size(_iter_pr_file_lines(pr_file))
+            pr_file.surrounding_context = self._read_surrounding_context(pr_file, context_lines)
+            if spare_chars is not None:
+                added_chars = rendered_size(_iter_pr_file_lines(pr_file)) - size_before
+                if added_chars > spare_chars:
+                    pr_file.surrounding_context = []
+                    continue
+                spare_chars -= added_chars
+
+    def _read_surrounding_context(self, pr_file: PrFile, context_lines: int) -> list[str]:
+        surrounding_context = []
+        for hunk_start, hunk_end in get_hunk_line_ranges(pr_file.file_diff):
+            for start, end in (
+                (max(1, hunk_start - context_lines), hunk_start - 1),
+                (hunk_end + 1, hunk_end + context_lines),
+            ):
+                if start > end:
+                    continue
+                lines = self.blob_store.read_lines(pr_file.blob_sha, start, end)
+                surrounding_context.extend(
+                    f"    {line_number}: {line}"
+                    for line_number, line in enumerate(lines or [], start=start)
+                )
+        return surrounding_context
+
+
+def parse_pr_link(pr_link: str) -> tuple[str, str, int]:
+    """Split a PR URL like https://github.com/org/repo/pull/123 into its
+    org name, repo name and PR number."""
+    split_pr_link: list[str] = pr_link.split("/")
+    return split_pr_link[3], split_pr_link[4], int(split_pr_link[-1])
+
+
+def get_hunk_line_ranges(file_diff: str | None) -> list[tuple[int, int]]:
+    """Return the (start, end) line range, in the new version of the file,
+    covered by each hunk of a unified diff."""
+    if not file_diff:
+        return []
+    ranges = []
+    for match in HUNK_HEADER_PATTERN.finditer(file_diff):
+        start = int(match.group(3))
+        length = int(match.group(4)) if match.group(4) is not None else 1
+        if length > 0:
+            ranges.append((start, start + length - 1))
+    return ranges
 
 
 # Provider function for dependency injection
@@ -105,7 +355,10 @@ def get_github_service() -> GithubService:
     if _github_service_instance is None:
         with _github_service_lock:
             if _github_service_instance is None:
-                _github_service_instance = GithubService()
+                _github_service_instance = GithubService(
+                    blob_store=get_blob_store(),
+                    fetch_concurrency=get_blob_store_config()["fetch_concurrency"],
+                )
                 _github_service_instance.authenticate()
     return _github_service_instance
 
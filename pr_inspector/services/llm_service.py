@@ -1,15 +1,39 @@
 """Service for interacting with LLM providers via LiteLLM."""
 
 import copy
+import logging
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
 
 import litellm
+import pydantic_core
 from litellm import ModelResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError, create_model
 
+from pr_inspector.config import get_llm_config
 from pr_inspector.env_loader import fetch_env_variable
+from pr_inspector.profiling import profile_worker_thread
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_MODEL = "gpt-4o-mini-2024-07-18"
+MAX_REPAIR_ATTEMPTS = 1
+# Rough average for English text and code, good enough for budgeting prompts.
+CHARS_PER_TOKEN = 4
+# Used for models LiteLLM has no metadata for.
+DEFAULT_CONTEXT_WINDOW_TOKENS = 128000
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Follow-up instruction for requesting a single top-level section of a
+# response. Sent after the original messages, so every section call shares
+# the same prompt prefix.
+SECTION_INSTRUCTION = (
+    "Generate ONLY the `{field_name}` section of the response. Return ONLY "
+    "valid JSON matching the required schema exactly."
+)
 
 
 def _fix_schema_for_openai(schema: dict) -> dict:
@@ -38,6 +62,153 @@ def _fix_schema_for_openai(schema: dict) -> dict:
     return schema_copy
 
 
+# Registry of compiled provider response formats, keyed by Pydantic model class.
+# Models are immutable class definitions, so each schema only needs compiling once.
+_response_format_registry: dict[type[BaseModel], dict] = {}
+_section_model_registry: dict[tuple[type[BaseModel], str], type[BaseModel]] = {}
+_registry_lock = threading.Lock()
+
+
+def get_response_format(response_format: type[BaseModel]) -> dict:
+    """Get the OpenAI structured output format for a Pydantic model, compiling
+    and caching it on first use."""
+    compiled = _response_format_registry.get(response_format)
+    if compiled is None:
+        # NOTE: later on, we'll see if there's a better way to do this.
+        # Right now, looks like OpenAI is annoyingly strict with their schema
+        # and I haven't found a better way to do this.
+        fixed_schema = _fix_schema_for_openai(response_format.model_json_schema())
+        compiled = {
+            "type": "json_schema",
+            "json_schema": {
+                "name": response_format.__name__.lower(),
+                "strict": True,
+                "schema": fixed_schema
+            }
+        }
+        with _registry_lock:
+            _response_format_registry[response_format] = compiled
+    return compiled
+
+
+def get_section_model(response_format: type[BaseModel], field_name: str) -> type[BaseModel]:
+    """Get a model wrapping a single top-level field of `response_format`, so
+    that section can be requested and validated on its own."""
+    key = (response_format, field_name)
+    section_model = _section_model_registry.get(key)
+    if section_model is None:
+        field_info = response_format.model_fields[field_name]
+        section_model = create_model(
+            f"{response_format.__name__}_{field_name}",
+            **{field_name: (field_info.annotation, ...)},
+        )
+        with _registry_lock:
+            _section_model_registry[key] = section_model
+    return section_model
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def get_context_window_tokens(model: str) -> int:
+    """Get the maximum number of input tokens a model accepts."""
+    try:
+        max_input_tokens = litellm.get_model_info(model).get("max_input_tokens")
+    except Exception:
+        max_input_tokens = None
+    if not max_input_tokens:
+        logger.warning(f"No context window known for {model}, assuming {DEFAULT_CONTEXT_WINDOW_TOKENS} tokens.")
+        return DEFAULT_CONTEXT_WINDOW_TOKENS
+    return max_input_tokens
+
+
+class LLMUnavailableError(Exception):
+    """Raised when the circuit breaker is open and LLM calls are being skipped."""
+
+
+# Errors that say the provider itself is struggling (unreachable, overloaded
+# or failing), as opposed to a problem with the request.
+TRANSIENT_LLM_ERRORS: tuple[type[Exception], ...] = (
+    litellm.exceptions.Timeout,
+    litellm.exceptions.APIConnectionError,
+    litellm.exceptions.RateLimitError,
+    litellm.exceptions.InternalServerError,
+    litellm.exceptions.ServiceUnavailableError,
+    litellm.exceptions.BadGatewayError,
+)
+# Errors after which callers can fall back to an LLM-free result.
+LLM_PROVIDER_ERRORS: tuple[type[Exception], ...] = (
+    LLMUnavailableError,
+    litellm.exceptions.APIError,
+    *TRANSIENT_LLM_ERRORS,
+)
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Whether an error from the provider should count towards opening the circuit breaker."""
+    if isinstance(error, TRANSIENT_LLM_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and status_code >= 500
+
+
+class CircuitBreaker:
+    """Stops sending requests to a failing provider for a while.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    requests are rejected until `reset_seconds` have passed. Then a single
+    trial request is let through: success closes the breaker again, failure
+    re-opens it. Only transient provider errors (see `is_transient_error`)
+    are recorded as failures; other errors just end the trial.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Whether requests would currently be rejected. Unlike
+        `allow_request`, this never claims the half-open trial."""
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            return self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_seconds
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._opened_at is not None or self._consecutive_failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """End a request that neither succeeded nor failed transiently,
+        without changing the breaker's state."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
 class LLMService:
     """LLM service for making API requests via LiteLLM."""
     
@@ -45,6 +216,12 @@ class LLMService:
         self.openai_api_key = fetch_env_variable("OPENAI_API_KEY")
         # Set the API key for litellm to use
         litellm.api_key = self.openai_api_key
+        llm_config = get_llm_config()
+        self.timeout_seconds: float = llm_config["timeout_seconds"]
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=llm_config["circuit_breaker_failures"],
+            reset_seconds=llm_config["circuit_breaker_reset_seconds"],
+        )
     
     def chat_completion(
         self,
@@ -64,38 +241,173 @@ class LLMService:
         
         Returns:
             The chat completion response from litellm
+        
+        Raises:
+            LLMUnavailableError: If the circuit breaker is open
         """
-        # If response_format is a Pydantic model, we need to fix the schema
-        # to add additionalProperties: false for OpenAI compatibility
+        if not self.circuit_breaker.allow_request():
+            raise LLMUnavailableError("LLM provider circuit breaker is open, skipping request.")
+        kwargs.setdefault("timeout", self.timeout_seconds)
+        # If response_format is a Pydantic model, use its compiled schema
+        # (with additionalProperties: false for OpenAI compatibility)
         if response_format is not None:
-            schema = response_format.model_json_schema()
-            # NOTE: later on, we'll see if there's a better way to do this.
-            # Right now, looks like OpenAI is annoyingly strict with their schema
-            # and I haven't found a better way to do this.
-            fixed_schema = _fix_schema_for_openai(schema)
-
-            # Convert to OpenAI's structured output format
-            response_format_dict = {
-                "type": "json_schema",
-                "json_schema": {
-                    "name": response_format.__name__.lower(),
-                    "strict": True,
-                    "schema": fixed_schema
-                }
-            }
-            return litellm.completion(
+            response_format = get_response_format(response_format)
+        try:
+            response = litellm.completion(
                 model=model,
                 messages=messages,
-                response_format=response_format_dict,
+                response_format=response_format,
                 **kwargs
             )
+        except Exception as e:
+            if is_transient_error(e):
+                self.circuit_breaker.record_failure()
+            else:
+                self.circuit_breaker.release_trial()
+            raise
+        self.circuit_breaker.record_success()
+        return response
+
+    def structured_completion(
+        self,
+        messages: list[dict],
+        response_format: type[ModelT],
+        model: str = DEFAULT_MODEL,
+        max_repair_attempts: int = MAX_REPAIR_ATTEMPTS,
+        **kwargs
+    ) -> ModelT:
+        """
+        Create a chat completion and validate it into a Pydantic model.
+        
+        If the response fails validation (e.g. malformed or truncated JSON),
+        only the top-level sections that failed are re-requested, and the
+        sections that did validate are kept.
         
-        return litellm.completion(
-            model=model,
-            messages=messages,
-            response_format=response_format,
-            **kwargs
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+            response_format: Pydantic model class for structured outputs
+            model: Model to use (default: gpt-4o-mini-2024-07-18)
+            max_repair_attempts: How many times to re-request a failing section
+            **kwargs: Additional parameters to pass to the API
+        
+        Returns:
+            An instance of `response_format`
+        """
+        response = self.chat_completion(
+            messages=messages, model=model, response_format=response_format, **kwargs
         )
+        # None if the model refused or the output was filtered.
+        content: str | None = response.choices[0].message.content
+        try:
+            return response_format.model_validate_json(content)
+        except ValidationError as e:
+            logger.warning(f"{response_format.__name__} failed validation, repairing failing sections: {e}")
+            return self._repair_sections(
+                content, messages, response_format, model, max_repair_attempts, **kwargs
+            )
+
+    def _repair_sections(
+        self,
+        content: str | None,
+        messages: list[dict],
+        response_format: type[ModelT],
+        model: str,
+        max_repair_attempts: int,
+        **kwargs
+    ) -> ModelT:
+        """Keep the sections of a failed response that validate on their own
+        and re-request the rest, concurrently, one section per call."""
+        truncated = False
+        partial_data = {}
+        # No content at all (refusal or content filter) means every section failed.
+        if content is not None:
+            try:
+                pydantic_core.from_json(content)
+            except ValueError:
+                truncated = True
+            try:
+                partial_data = pydantic_core.from_json(content, allow_partial=True)
+            except ValueError:
+                partial_data = {}
+            if not isinstance(partial_data, dict):
+                partial_data = {}
+        # If the output was cut off, the last section present may itself be cut short.
+        suspect_field = list(partial_data)[-1] if truncated and partial_data else None
+
+        sections = {}
+        failing_fields = []
+        for field_name in response_format.model_fields:
+            section_model = get_section_model(response_format, field_name)
+            if field_name in partial_data and field_name != suspect_field:
+                try:
+                    section = section_model.model_validate({field_name: partial_data[field_name]})
+                    sections[field_name] = getattr(section, field_name)
+                    continue
+                except ValidationError:
+                    pass
+            failing_fields.append(field_name)
+        if failing_fields:
+            logger.info(f"Re-requesting sections: {', '.join(failing_fields)}")
+            with ThreadPoolExecutor(
+                max_workers=len(failing_fields), initializer=profile_worker_thread
+            ) as executor:
+                futures = {
+                    field_name: executor.submit(
+                        self.request_section,
+                        messages,
+                        response_format,
+                        field_name,
+                        model,
+                        max_repair_attempts,
+                        **kwargs,
+                    )
+                    for field_name in failing_fields
+                }
+                for field_name, future in futures.items():
+                    sections[field_name] = future.result()
+        return response_format.model_validate(sections)
+
+    def request_section(
+        self,
+        messages: list[dict],
+        response_format: type[BaseModel],
+        field_name: str,
+        model: str = DEFAULT_MODEL,
+        max_repair_attempts: int = MAX_REPAIR_ATTEMPTS,
+        **kwargs
+    ):
+        """
+        Request and validate a single top-level section of `response_format`.
+
+        Args:
+            messages: The messages the full response would be generated from
+            response_format: Pydantic model class the section belongs to
+            field_name: Name of the section's field in `response_format`
+            model: Model to use (default: gpt-4o-mini-2024-07-18)
+            max_repair_attempts: How many times to re-request the section if
+                it fails validation
+            **kwargs: Additional parameters to pass to the API
+
+        Returns:
+            The validated value of the section's field
+        """
+        section_model = get_section_model(response_format, field_name)
+        section_messages = messages + [{
+            "role": "user",
+            "content": SECTION_INSTRUCTION.format(field_name=field_name),
+        }]
+        for attempt in range(max_repair_attempts + 1):
+            response = self.chat_completion(
+                messages=section_messages, model=model, response_format=section_model, **kwargs
+            )
+            try:
+                # model_validate_json raises ValidationError for None content too.
+                section = section_model.model_validate_json(response.choices[0].message.content)
+                return getattr(section, field_name)
+            except ValidationError:
+                if attempt == max_repair_attempts:
+                    raise
+                logger.warning(f"Section {field_name} failed validation, retrying.")
 
 
 # Provider function for dependency injection
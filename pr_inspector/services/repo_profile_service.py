@@ -0,0 +1,264 @@
+"""Service for building and caching per-repository profiles."""
+
+import logging
+import posixpath
+import re
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from github.GitTreeElement import GitTreeElement
+from github.Repository import Repository
+
+from pr_inspector.services.github_service import GithubService, get_github_service
+
+logger = logging.getLogger(__name__)
+
+MAX_DIRECTORIES = 30
+MAX_TEST_DIRECTORIES = 10
+MAX_CODEOWNERS_RULES = 20
+MAX_KEY_MODULES = 20
+# Cap on the git tree API calls spent listing a repo too large for one recursive call.
+MAX_TREE_REQUESTS = 50
+
+CODEOWNERS_PATHS = ("CODEOWNERS", ".github/CODEOWNERS", "docs/CODEOWNERS")
+STYLE_CONFIG_FILES = {
+    "pyproject.toml", "setup.cfg", "tox.ini", ".flake8", "ruff.toml", ".ruff.toml",
+    "mypy.ini", ".pylintrc", ".editorconfig", ".pre-commit-config.yaml",
+    ".prettierrc", ".prettierrc.json", ".eslintrc", ".eslintrc.js", ".eslintrc.json",
+    "eslint.config.js", "tsconfig.json", ".golangci.yml", "rustfmt.toml", ".rubocop.yml",
+}
+ENTRYPOINT_FILES = {
+    "__main__.py", "main.py", "app.py", "server.py", "cli.py", "manage.py",
+    "index.js", "index.ts", "main.go", "main.rs",
+}
+TEST_PATH_PATTERN = re.compile(
+    r"(^|/)(tests?|__tests__|spec)/|(^|/)test_[^/]+\.py$|_test\.(py|go)$|\.(test|spec)\.[jt]sx?$"
+)
+
+
+@dataclass
+class RepoProfile:
+    """Conventions and layout of a repository at a given default-branch commit."""
+    full_name: str
+    default_branch_sha: str
+    directory_map: list[str]
+    test_layout: list[str]
+    style_configs: list[str]
+    codeowners: list[str]
+    key_modules: list[str]
+    # Whether the repo was too large to list every file.
+    partial: bool = False
+
+    def to_digest(self, max_chars: int) -> str:
+        """Render a compact digest of the profile for inclusion in prompts."""
+        sections = [
+            ("Directory map", self.directory_map),
+            ("Test layout", self.test_layout),
+            ("Style configs", self.style_configs),
+            ("CODEOWNERS", self.codeowners),
+            ("Key modules", self.key_modules),
+        ]
+        output = [f"Repository: {self.full_name} (default branch @ {self.default_branch_sha[:7]})"]
+        if self.partial:
+            output.append("(Partial profile: the repository is too large to list every file.)")
+        for title, entries in sections:
+            if entries:
+                output.append(f"{title}:")
+                output.extend(f"  - {entry}" for entry in entries)
+        digest = "\n".join(output)
+        if len(digest) > max_chars:
+            digest = digest[:max_chars] + " ..."
+        return digest
+
+
+class RepoProfileService:
+    """Builds repository profiles from the default branch and caches them by
+    the default branch's head SHA.
+
+    A cached profile is served as long as the default branch has not moved.
+    When it has, the stale profile is still served while a fresh one is
+    rebuilt in the background, so only the very first request for a repo
+    pays for building its profile. Concurrent requests share a single build.
+    """
+
+    def __init__(self, github_service: GithubService):
+        self.github_service = github_service
+        self._profiles: dict[str, RepoProfile] = {}
+        # Builds in progress, by repo full name.
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="repo-profile")
+
+    def get_profile(self, org_name: str, repo_name: str) -> RepoProfile | None:
+        """
+        Get the profile for a repository.
+
+        Args:
+            org_name: GitHub organization or user
+            repo_name: Repository name
+
+        Returns:
+            The cached or freshly built profile, or None if it could not be built
+        """
+        full_name = f"{org_name}/{repo_name}"
+        try:
+            repo: Repository = self.github_service.get_repo(org_name, repo_name)
+            head_sha: str = repo.get_branch(repo.default_branch).commit.sha
+        except Exception as e:
+            logger.warning(f"Failed to resolve default branch for {full_name}: {e}")
+            return self._profiles.get(full_name)
+
+        cached = self._profiles.get(full_name)
+        if cached is not None:
+            if cached.default_branch_sha != head_sha:
+                self._start_build(org_name, repo_name, head_sha, background=True)
+            return cached
+        return self._start_build(org_name, repo_name, head_sha, background=False).result()
+
+    def _start_build(self, org_name: str, repo_name: str, head_sha: str, background: bool) -> Future:
+        """Start building a profile, or join the build already in progress for
+        the repo. A foreground build runs on the calling thread."""
+        full_name = f"{org_name}/{repo_name}"
+        with self._lock:
+            future = self._pending.get(full_name)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[full_name] = future
+        if background:
+            self._executor.submit(self._rebuild, org_name, repo_name, head_sha, future)
+        else:
+            self._rebuild(org_name, repo_name, head_sha, future)
+        return future
+
+    def _rebuild(self, org_name: str, repo_name: str, head_sha: str, future: Future) -> None:
+        full_name = f"{org_name}/{repo_name}"
+        profile: RepoProfile | None = None
+        try:
+            profile = self._build_profile(org_name, repo_name, head_sha)
+            self._profiles[full_name] = profile
+            logger.info(f"Built repo profile for {full_name} at {head_sha[:7]}.")
+        except Exception as e:
+            logger.warning(f"Failed to build repo profile for {full_name}: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(full_name, None)
+            future.set_result(profile)
+
+    def _build_profile(self, org_name: str, repo_name: str, head_sha: str) -> RepoProfile:
+        repo: Repository = self.github_service.get_repo(org_name, repo_name)
+        tree_entries: dict[str, GitTreeElement] = {}
+        complete = _list_blobs(repo, head_sha, "", tree_entries, requests_left=[MAX_TREE_REQUESTS])
+        if not complete:
+            logger.warning(f"{org_name}/{repo_name} is too large to list fully, building a partial profile.")
+        paths = list(tree_entries)
+        codeowners: list[str] = []
+        for codeowners_path in CODEOWNERS_PATHS:
+            if codeowners_path in tree_entries:
+                codeowners = self._read_codeowners(org_name, repo_name, tree_entries[codeowners_path].sha)
+                break
+        return RepoProfile(
+            full_name=f"{org_name}/{repo_name}",
+            default_branch_sha=head_sha,
+            directory_map=_build_directory_map(paths),
+            test_layout=_build_test_layout(paths),
+            style_configs=sorted(path for path in paths if path in STYLE_CONFIG_FILES),
+            codeowners=codeowners,
+            key_modules=_find_key_modules(paths),
+            partial=not complete,
+        )
+
+    def _read_codeowners(self, org_name: str, repo_name: str, blob_sha: str) -> list[str]:
+        if not self.github_service.fetch_blob(org_name, repo_name, blob_sha):
+            return []
+        lines = self.github_service.blob_store.read_lines(blob_sha, 1, 1000) or []
+        rules = [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+        return rules[:MAX_CODEOWNERS_RULES]
+
+
+def _list_blobs(
+    repo: Repository,
+    tree_sha: str,
+    prefix: str,
+    blobs: dict[str, GitTreeElement],
+    requests_left: list[int],
+) -> bool:
+    """
+    Collect the blobs under a git tree into `blobs`, keyed by path.
+
+    A single recursive tree call usually lists every path, but GitHub
+    truncates it for very large trees. Those are listed one level at a time,
+    recursing into each subdirectory, until `requests_left` (a one-element
+    counter shared across the recursion) runs out.
+
+    Returns:
+        Whether every blob was listed
+    """
+    if requests_left[0] <= 0:
+        return False
+    requests_left[0] -= 1
+    tree = repo.get_git_tree(tree_sha, recursive=True)
+    if not tree.truncated:
+        blobs.update((prefix + entry.path, entry) for entry in tree.tree if entry.type == "blob")
+        return True
+    if requests_left[0] <= 0:
+        return False
+    requests_left[0] -= 1
+    complete = True
+    for entry in repo.get_git_tree(tree_sha).tree:
+        if entry.type == "blob":
+            blobs[prefix + entry.path] = entry
+        elif entry.type == "tree":
+            complete = _list_blobs(repo, entry.sha, f"{prefix}{entry.path}/", blobs, requests_left) and complete
+    return complete
+
+
+def _build_directory_map(paths: list[str]) -> list[str]:
+    """Count files under each top-level and second-level directory."""
+    counts: Counter[str] = Counter()
+    for path in paths:
+        parts = path.split("/")[:-1]
+        for depth in range(1, min(len(parts), 2) + 1):
+            counts["/".join(parts[:depth]) + "/"] += 1
+    directories = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:MAX_DIRECTORIES]
+    return [f"{directory} ({count} files)" for directory, count in sorted(directories)]
+
+
+def _build_test_layout(paths: list[str]) -> list[str]:
+    """Find the directories holding tests, most tests first."""
+    test_directories: Counter[str] = Counter(
+        posixpath.dirname(path) or "." for path in paths if TEST_PATH_PATTERN.search(path)
+    )
+    return [
+        f"{directory}/ ({count} test files)"
+        for directory, count in test_directories.most_common(MAX_TEST_DIRECTORIES)
+    ]
+
+
+def _find_key_modules(paths: list[str]) -> list[str]:
+    """Find top-level Python packages and entrypoint files."""
+    key_modules = set()
+    for path in paths:
+        parts = path.split("/")
+        if parts[-1] == "__init__.py" and len(parts) <= 3:
+            key_modules.add("/".join(parts[:-1]) + "/")
+        elif parts[-1] in ENTRYPOINT_FILES and len(parts) <= 3:
+            key_modules.add(path)
+    return sorted(key_modules)[:MAX_KEY_MODULES]
+
+
+# Provider function for dependency injection
+_repo_profile_service_instance: RepoProfileService | None = None
+_repo_profile_service_lock = threading.Lock()
+
+
+def get_repo_profile_service() -> RepoProfileService:
+    """Dependency provider for repo profile service."""
+    global _repo_profile_service_instance
+    if _repo_profile_service_instance is None:
+        with _repo_profile_service_lock:
+            if _repo_profile_service_instance is None:
+                _repo_profile_service_instance = RepoProfileService(get_github_service())
+    return _repo_profile_service_instance
@@ -0,0 +1,78 @@
+"""Unit tests for the local blob store."""
+
+import os
+import threading
+import time
+
+from pr_inspector.services.blob_store import BlobStore
+
+
+def _age(store: BlobStore, sha: str, seconds_ago: float) -> None:
+    timestamp = time.time() - seconds_ago
+    os.utime(store._blob_path(sha), (timestamp, timestamp))
+
+
+def test_put_and_read_lines(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024)
+    store.put("abc123", b"one\ntwo\nthree\nfour")
+
+    assert store.contains("abc123")
+    assert store.read_lines("abc123", 2, 3) == ["two", "three"]
+    assert store.read_lines("abc123", 3, 10) == ["three", "four"]
+    assert store.read_lines("abc123", 5, 6) == []
+    assert store.read_text("abc123") == "one\ntwo\nthree\nfour"
+
+
+def test_read_missing_and_empty_blobs(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024)
+    store.put("empty", b"")
+
+    assert store.read_lines("missing", 1, 2) is None
+    assert store.read_text("missing") is None
+    assert store.read_lines("empty", 1, 2) == []
+
+
+def test_put_existing_sha_is_noop(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024)
+    store.put("abc123", b"first")
+    store.put("abc123", b"second")
+
+    assert store.read_text("abc123") == "first"
+    assert store._total_bytes == len(b"first")
+
+
+def test_concurrent_puts_of_same_sha_count_once(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024)
+    threads = [threading.Thread(target=store.put, args=("abc123", b"12345")) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store._total_bytes == 5
+    assert list(store._iter_blob_paths()) == [store._blob_path("abc123")]
+
+
+def test_evicts_least_recently_used_down_to_low_water_mark(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=100)
+    for index, sha in enumerate(["aa01", "aa02", "aa03"]):
+        store.put(sha, b"x" * 30)
+        _age(store, sha, seconds_ago=100 - index)
+    # Reading a blob makes it the most recently used.
+    store.read_lines("aa01", 1, 1)
+
+    store.put("aa04", b"x" * 30)
+
+    # 120 bytes is over the cap, and evicting one blob leaves 90, which is
+    # exactly the low-water mark.
+    assert store.contains("aa01")
+    assert not store.contains("aa02")
+    assert store.contains("aa03")
+    assert store.contains("aa04")
+    assert store._total_bytes == 90
+
+
+def test_total_bytes_restored_from_disk(tmp_path):
+    BlobStore(str(tmp_path), max_bytes=1024).put("abc123", b"12345")
+
+    assert BlobStore(str(tmp_path), max_bytes=1024)._total_bytes == 5
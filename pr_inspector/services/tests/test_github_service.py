@@ -0,0 +1,102 @@
+"""Unit tests for diff hunk parsing and surrounding context."""
+
+from pr_inspector.services.blob_store import BlobStore
+from pr_inspector.services.github_service import (
+    GithubService,
+    PrDetails,
+    PrFile,
+    get_hunk_line_ranges,
+    rendered_size,
+)
+
+HEAD_SOURCE = "".join(f"line {number}\n" for number in range(1, 21)).encode()
+
+
+def test_hunk_line_ranges():
+    diff = (
+        "@@ -1,3 +1,4 @@ header\n"
+        " a\n+b\n c\n d\n"
+        "@@ -10 +11 @@\n-x\n+y\n"
+        "@@ -15,2 +16,0 @@\n-gone\n-gone\n"
+    )
+
+    # Single-line hunks omit their length; pure removals cover no new lines.
+    assert get_hunk_line_ranges(diff) == [(1, 4), (11, 11)]
+    assert get_hunk_line_ranges(None) == []
+    assert get_hunk_line_ranges("") == []
+
+
+def _pr_details(*pr_files: PrFile) -> PrDetails:
+    return PrDetails("org", "repo", 1, "title", "body", list(pr_files))
+
+
+def test_attach_surrounding_context_reads_lines_around_hunks(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024 * 1024)
+    store.put("head", HEAD_SOURCE)
+    pr_file = PrFile("app.txt", "@@ -5,2 +5,2 @@\n-old\n+line 5\n line 6\n", blob_sha="head", status="modified")
+    removed = PrFile("gone.txt", "@@ -1 +0,0 @@\n-gone\n", blob_sha="head", status="removed")
+
+    GithubService(blob_store=store).attach_surrounding_context(_pr_details(pr_file, removed), context_lines=2)
+
+    assert pr_file.surrounding_context == [
+        "    3: line 3",
+        "    4: line 4",
+        "    7: line 7",
+        "    8: line 8",
+    ]
+    assert removed.surrounding_context == []
+
+
+def test_attach_surrounding_context_clamps_to_file_start(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024 * 1024)
+    store.put("head", HEAD_SOURCE)
+    pr_file = PrFile("app.txt", "@@ -1 +1 @@\n-old\n+line 1\n", blob_sha="head", status="modified")
+
+    GithubService(blob_store=store).attach_surrounding_context(_pr_details(pr_file), context_lines=1)
+
+    assert pr_file.surrounding_context == ["    2: line 2"]
+
+
+def test_attach_surrounding_context_never_pushes_files_out_of_budget(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024 * 1024)
+    store.put("head", HEAD_SOURCE)
+    diff = "@@ -5 +5 @@\n-old\n+line 5\n"
+    pr_files = [PrFile(f"file_{index}.txt", diff, blob_sha="head", status="modified") for index in range(3)]
+    pr_details = _pr_details(*pr_files)
+    # Room for every file, plus context for about one of them.
+    max_chars = rendered_size(pr_details.iter_lines()) + 60
+
+    GithubService(blob_store=store).attach_surrounding_context(pr_details, context_lines=2, max_chars=max_chars)
+
+    assert [bool(pr_file.surrounding_context) for pr_file in pr_files] == [True, False, False]
+    assert pr_details.files_within_budget(max_chars) == pr_files
+
+
+def test_files_within_budget_matches_rendered_files():
+    pr_files = [PrFile(f"file_{index}.txt", "@@ -1 +1 @@\n-a\n+b\n" + "x" * 100) for index in range(5)]
+    pr_details = _pr_details(*pr_files)
+
+    rendered = "\n".join(pr_details.iter_lines(max_chars=300))
+
+    assert pr_details.files_within_budget(300) == pr_files[:3]
+    assert "file_2.txt" in rendered and "file_3.txt" not in rendered
+    assert "2 more files omitted" in rendered
+
+
+def test_summarized_files_get_no_surrounding_context(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024 * 1024)
+    store.put("head", HEAD_SOURCE)
+    pr_file = PrFile(
+        "app.py", "@@ -5 +5 @@\n-old\n+line 5\n", blob_sha="head", status="modified",
+        symbol_summary=["    ~ modified function `f` (lines 4-6)"],
+    )
+    pr_details = _pr_details(pr_file)
+
+    GithubService(blob_store=store).attach_surrounding_context(pr_details, context_lines=2)
+    assert pr_file.surrounding_context == []
+
+    # Context attached earlier isn't rendered once the file is summarized.
+    pr_file.surrounding_context = ["    4: line 4"]
+    rendered = list(pr_details.iter_lines())
+    assert "  Surrounding Context:" not in rendered
+    assert "  Diff Start:" not in "\n".join(rendered)
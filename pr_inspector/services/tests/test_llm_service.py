@@ -0,0 +1,179 @@
+"""Unit tests for the LLM service's structured output handling and circuit breaker."""
+
+import json
+from types import SimpleNamespace
+
+import litellm
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from pr_inspector.services import llm_service
+from pr_inspector.services.llm_service import CircuitBreaker, LLMService, LLMUnavailableError
+
+
+class Answer(BaseModel):
+    summary: str
+    items: list[str]
+
+
+def _response(content: str | None) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    """Fake litellm.completion: the full request returns `first`, and each
+    section re-request returns the matching entry of `sections`."""
+    calls = []
+    state = {"first": None, "sections": {}}
+
+    def fake_completion(model, messages, response_format=None, **kwargs):
+        calls.append(messages)
+        if len(messages) == 1:
+            return _response(state["first"])
+        field_name = next(iter(response_format["json_schema"]["schema"]["properties"]))
+        return _response(state["sections"][field_name])
+
+    monkeypatch.setattr(llm_service.litellm, "completion", fake_completion)
+    state["calls"] = calls
+    return state
+
+
+MESSAGES = [{"role": "user", "content": "prompt"}]
+
+
+def test_valid_response_needs_no_repair(completions):
+    completions["first"] = json.dumps({"summary": "ok", "items": ["a"]})
+
+    answer = LLMService().structured_completion(MESSAGES, Answer)
+
+    assert answer == Answer(summary="ok", items=["a"])
+    assert len(completions["calls"]) == 1
+
+
+def test_truncated_response_rerequests_only_last_section(completions):
+    completions["first"] = '{"summary": "ok", "items": ["a", "b'
+    completions["sections"] = {"items": json.dumps({"items": ["a", "b", "c"]})}
+
+    answer = LLMService().structured_completion(MESSAGES, Answer)
+
+    assert answer == Answer(summary="ok", items=["a", "b", "c"])
+    assert len(completions["calls"]) == 2
+
+
+def test_invalid_section_is_rerequested(completions):
+    completions["first"] = json.dumps({"summary": 3, "items": ["a"]})
+    completions["sections"] = {"summary": json.dumps({"summary": "fixed"})}
+
+    answer = LLMService().structured_completion(MESSAGES, Answer)
+
+    assert answer == Answer(summary="fixed", items=["a"])
+    assert len(completions["calls"]) == 2
+
+
+def test_missing_content_rerequests_every_section(completions):
+    completions["first"] = None
+    completions["sections"] = {
+        "summary": json.dumps({"summary": "ok"}),
+        "items": json.dumps({"items": []}),
+    }
+
+    answer = LLMService().structured_completion(MESSAGES, Answer)
+
+    assert answer == Answer(summary="ok", items=[])
+    assert len(completions["calls"]) == 3
+
+
+def test_section_failing_every_attempt_raises(completions):
+    completions["first"] = None
+    completions["sections"] = {"summary": None, "items": json.dumps({"items": []})}
+
+    with pytest.raises(ValidationError):
+        LLMService().structured_completion(MESSAGES, Answer, max_repair_attempts=1)
+
+
+def _failing_completion(monkeypatch, error: Exception) -> list:
+    calls = []
+
+    def fake_completion(model, messages, response_format=None, **kwargs):
+        calls.append(messages)
+        raise error
+
+    monkeypatch.setattr(llm_service.litellm, "completion", fake_completion)
+    return calls
+
+
+def _service_with_breaker(failure_threshold: int, reset_seconds: float) -> LLMService:
+    service = LLMService()
+    service.circuit_breaker = CircuitBreaker(failure_threshold, reset_seconds)
+    return service
+
+
+def test_breaker_opens_after_consecutive_transient_failures(monkeypatch):
+    calls = _failing_completion(monkeypatch, litellm.exceptions.Timeout("slow", model="m", llm_provider="openai"))
+    service = _service_with_breaker(failure_threshold=2, reset_seconds=60)
+
+    for _ in range(2):
+        with pytest.raises(litellm.exceptions.Timeout):
+            service.chat_completion(MESSAGES)
+    with pytest.raises(LLMUnavailableError):
+        service.chat_completion(MESSAGES)
+
+    assert len(calls) == 2
+
+
+def test_breaker_ignores_request_errors(monkeypatch):
+    _failing_completion(monkeypatch, litellm.exceptions.BadRequestError("bad", model="m", llm_provider="openai"))
+    service = _service_with_breaker(failure_threshold=2, reset_seconds=60)
+
+    for _ in range(3):
+        with pytest.raises(litellm.exceptions.BadRequestError):
+            service.chat_completion(MESSAGES)
+
+    assert service.circuit_breaker.allow_request()
+
+
+def test_breaker_trial_closes_on_success_and_reopens_on_failure():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+
+    # Half-open: a single trial is let through at a time.
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_success()
+
+    assert breaker.allow_request()
+    assert breaker.allow_request()
+
+
+def test_breaker_trial_released_by_request_error():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    assert breaker.allow_request()
+
+    breaker.release_trial()
+
+    assert breaker.allow_request()
+
+
+def test_request_section_returns_the_section_value(completions):
+    completions["sections"] = {"items": json.dumps({"items": ["a"]})}
+
+    items = LLMService().request_section(MESSAGES, Answer, "items")
+
+    assert items == ["a"]
+    assert "`items` section" in completions["calls"][0][-1]["content"]
+
+
+def test_is_open_does_not_claim_the_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    assert not breaker.is_open()
+    breaker.record_failure()
+
+    # Reset period over: half-open, and checking doesn't use up the trial.
+    assert not breaker.is_open()
+    assert not breaker.is_open()
+    assert breaker.allow_request()
+    assert breaker.is_open()
@@ -0,0 +1,127 @@
+"""Unit tests for repository profile building."""
+
+from types import SimpleNamespace
+
+from pr_inspector.services import repo_profile_service
+from pr_inspector.services.repo_profile_service import (
+    RepoProfile,
+    _build_directory_map,
+    _build_test_layout,
+    _find_key_modules,
+    _list_blobs,
+)
+
+
+def _entry(path: str, entry_type: str, sha: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(path=path, type=entry_type, sha=sha or path)
+
+
+class FakeRepo:
+    """Serves git trees by SHA. Trees in `truncated` come back truncated
+    from a recursive listing, like GitHub does for very large trees."""
+
+    def __init__(self, trees: dict[str, list[SimpleNamespace]], truncated: set[str] = frozenset()):
+        self.trees = trees
+        self.truncated = truncated
+        self.calls = []
+
+    def _flatten(self, tree_sha: str, prefix: str = "") -> list[SimpleNamespace]:
+        entries = []
+        for entry in self.trees[tree_sha]:
+            entries.append(_entry(prefix + entry.path, entry.type, entry.sha))
+            if entry.type == "tree":
+                entries.extend(self._flatten(entry.sha, f"{prefix}{entry.path}/"))
+        return entries
+
+    def get_git_tree(self, tree_sha: str, recursive: bool = False):
+        self.calls.append((tree_sha, recursive))
+        if not recursive:
+            return SimpleNamespace(tree=self.trees[tree_sha], truncated=False)
+        if tree_sha in self.truncated:
+            return SimpleNamespace(tree=[], truncated=True)
+        return SimpleNamespace(tree=self._flatten(tree_sha), truncated=False)
+
+
+TREES = {
+    "root": [_entry("README.md", "blob"), _entry("pkg", "tree", "pkg-tree"), _entry("docs", "tree", "docs-tree")],
+    "pkg-tree": [_entry("__init__.py", "blob"), _entry("sub", "tree", "sub-tree")],
+    "sub-tree": [_entry("mod.py", "blob")],
+    "docs-tree": [_entry("index.md", "blob")],
+}
+ALL_PATHS = {"README.md", "pkg/__init__.py", "pkg/sub/mod.py", "docs/index.md"}
+
+
+def test_list_blobs_untruncated_tree_takes_one_call():
+    repo = FakeRepo(TREES)
+    blobs = {}
+
+    assert _list_blobs(repo, "root", "", blobs, requests_left=[5])
+    assert set(blobs) == ALL_PATHS
+    assert repo.calls == [("root", True)]
+
+
+def test_list_blobs_recurses_into_truncated_trees():
+    repo = FakeRepo(TREES, truncated={"root", "pkg-tree"})
+    blobs = {}
+
+    assert _list_blobs(repo, "root", "", blobs, requests_left=[10])
+    assert set(blobs) == ALL_PATHS
+
+
+def test_list_blobs_stops_at_request_cap():
+    repo = FakeRepo(TREES, truncated={"root", "pkg-tree"})
+    blobs = {}
+
+    # Two calls for the root, one for the truncated pkg tree: nothing left for the rest.
+    assert not _list_blobs(repo, "root", "", blobs, requests_left=[3])
+    assert len(repo.calls) == 3
+    assert "README.md" in blobs and "pkg/sub/mod.py" not in blobs
+
+
+def test_directory_map_counts_two_levels(monkeypatch):
+    paths = ["a/x.py", "a/b/y.py", "a/b/c/z.py", "top.py", "d/w.py"]
+
+    assert _build_directory_map(paths) == ["a/ (3 files)", "a/b/ (2 files)", "d/ (1 files)"]
+
+    monkeypatch.setattr(repo_profile_service, "MAX_DIRECTORIES", 2)
+    assert _build_directory_map(paths) == ["a/ (3 files)", "a/b/ (2 files)"]
+
+
+def test_test_layout_most_tests_first():
+    paths = [
+        "tests/test_a.py", "tests/test_b.py", "pkg/test_c.py", "web/app.test.ts",
+        "pkg/module.py", "go/thing_test.go", "tests/conftest.py",
+    ]
+
+    assert _build_test_layout(paths) == [
+        "tests/ (3 test files)",
+        "pkg/ (1 test files)",
+        "web/ (1 test files)",
+        "go/ (1 test files)",
+    ]
+
+
+def test_key_modules_are_shallow_packages_and_entrypoints():
+    paths = ["pkg/__init__.py", "pkg/deep/er/__init__.py", "src/app/__init__.py", "server.py", "a/b/c/main.py"]
+
+    assert _find_key_modules(paths) == ["pkg/", "server.py", "src/app/"]
+
+
+def test_digest_is_truncated_and_notes_partial_profile():
+    profile = RepoProfile(
+        full_name="org/repo",
+        default_branch_sha="0123456789",
+        directory_map=["pkg/ (10 files)"],
+        test_layout=[],
+        style_configs=["pyproject.toml"],
+        codeowners=[],
+        key_modules=[f"module_{index}.py" for index in range(50)],
+        partial=True,
+    )
+
+    digest = profile.to_digest(max_chars=10_000)
+    assert digest.startswith("Repository: org/repo (default branch @ 0123456)\n(Partial profile")
+    assert "Test layout" not in digest
+
+    truncated = profile.to_digest(max_chars=100)
+    assert truncated == digest[:100] + " ..."
@@ -0,0 +1,147 @@
+"""Unit tests for admission control."""
+
+import threading
+import time
+
+import pytest
+
+from pr_inspector.admission import AdmissionController, ServerBusyError, charge_tokens
+
+
+def _controller(**overrides) -> AdmissionController:
+    settings = dict(
+        max_concurrent=1,
+        max_concurrent_per_client=1,
+        max_queue_size=16,
+        max_wait_seconds=5,
+        tokens_per_minute_per_client=1000,
+    )
+    settings.update(overrides)
+    return AdmissionController(**settings)
+
+
+class _Holder:
+    """Holds an admitted slot in a background thread until released."""
+
+    def __init__(self, controller: AdmissionController, client_id: str, priority: str = "interactive"):
+        self._admitted = threading.Event()
+        self._release = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(controller, client_id, priority))
+        self._thread.start()
+        assert self._admitted.wait(5)
+
+    def _run(self, controller, client_id, priority):
+        with controller.admit(client_id, priority):
+            self._admitted.set()
+            self._release.wait(5)
+
+    def release(self) -> None:
+        self._release.set()
+        self._thread.join(5)
+
+
+def _queue_requests(controller: AdmissionController, requests: list[tuple[str, str]], order: list) -> list:
+    """Queue requests one at a time, recording the order they are admitted in."""
+    threads = []
+    for client_id, priority in requests:
+        def run(client_id=client_id, priority=priority):
+            with controller.admit(client_id, priority):
+                order.append((client_id, priority))
+        queued = len(controller._waiters)
+        thread = threading.Thread(target=run)
+        thread.start()
+        threads.append(thread)
+        while len(controller._waiters) == queued:
+            time.sleep(0.001)
+    return threads
+
+
+def test_waiters_are_served_fairly_across_clients_and_priorities():
+    controller = _controller()
+    holder = _Holder(controller, "holder")
+    order = []
+    threads = _queue_requests(
+        controller,
+        [("flood", "batch"), ("flood", "batch"), ("flood", "batch"), ("other", "interactive")],
+        order,
+    )
+
+    holder.release()
+    for thread in threads:
+        thread.join(5)
+
+    # The interactive request from another client overtakes the flood's queue.
+    assert order[0] == ("other", "interactive")
+    assert order[1:] == [("flood", "batch")] * 3
+
+
+def test_per_client_cap_lets_other_clients_through():
+    controller = _controller(max_concurrent=2)
+    holder = _Holder(controller, "a")
+    order = []
+    threads = _queue_requests(controller, [("a", "interactive")], order)
+
+    with controller.admit("b"):
+        assert order == []
+    holder.release()
+    for thread in threads:
+        thread.join(5)
+
+    assert order == [("a", "interactive")]
+
+
+def test_client_over_quota_is_shed_for_at_most_a_minute():
+    controller = _controller()
+    with controller.admit("a"):
+        charge_tokens(1_000_000)
+
+    with pytest.raises(ServerBusyError, match="token quota") as error:
+        with controller.admit("a"):
+            pass
+    assert 59 < error.value.retry_after_seconds <= 60
+    with controller.admit("b"):
+        pass
+
+
+def test_full_queue_is_shed():
+    controller = _controller(max_queue_size=1)
+    holder = _Holder(controller, "a")
+    threads = _queue_requests(controller, [("b", "interactive")], [])
+
+    with pytest.raises(ServerBusyError, match="queue is full"):
+        with controller.admit("c"):
+            pass
+    holder.release()
+    for thread in threads:
+        thread.join(5)
+
+
+def test_waiting_too_long_is_shed():
+    controller = _controller(max_wait_seconds=0.05)
+    holder = _Holder(controller, "a")
+
+    with pytest.raises(ServerBusyError, match="Timed out"):
+        with controller.admit("b"):
+            pass
+    holder.release()
+
+    assert controller._waiters == []
+
+
+def test_idle_client_state_is_dropped():
+    controller = _controller()
+    for index in range(100):
+        with controller.admit(f"client-{index}", "prefetch"):
+            pass
+
+    assert controller._flow_finish == {}
+    assert controller._token_buckets == {}
+    assert controller._in_flight_by_client == {}
+
+
+def test_client_in_debt_keeps_its_bucket():
+    controller = _controller()
+    with controller.admit("a"):
+        charge_tokens(500)
+
+    assert set(controller._token_buckets) == {"a"}
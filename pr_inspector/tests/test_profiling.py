@@ -0,0 +1,53 @@
+"""Unit tests for per-request profiling."""
+
+import pstats
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pr_inspector.profiling import ThreadProfiler, profile_worker_thread
+
+
+def _worker_task() -> None:
+    sum(range(1000))
+
+
+def _profiled_function_names(profiler: ThreadProfiler, tmp_path) -> set[str]:
+    path = tmp_path / "out.prof"
+    profiler.dump_stats(path)
+    return {function_name for _, _, function_name in pstats.Stats(str(path)).stats}
+
+
+def test_request_executor_workers_are_profiled(tmp_path):
+    profiler = ThreadProfiler()
+    profiler.start()
+    with ThreadPoolExecutor(max_workers=2, initializer=profile_worker_thread) as executor:
+        list(executor.map(lambda _: _worker_task(), range(4)))
+    profiler.stop()
+
+    assert "_worker_task" in _profiled_function_names(profiler, tmp_path)
+
+
+def test_no_profiler_outlives_the_request():
+    profiler = ThreadProfiler()
+    profiler.start()
+    started = threading.Event()
+    release = threading.Event()
+    hooks = []
+
+    def long_lived() -> None:
+        started.set()
+        release.wait(5)
+        hooks.append(sys.getprofile())
+
+    # A thread that isn't a request-scoped executor worker, e.g. a shared pool.
+    thread = threading.Thread(target=long_lived)
+    thread.start()
+    started.wait(5)
+    profiler.stop()
+    release.set()
+    thread.join(5)
+    with ThreadPoolExecutor(max_workers=1, initializer=profile_worker_thread) as executor:
+        executor.submit(lambda: hooks.append(sys.getprofile())).result()
+
+    assert hooks == [None, None]
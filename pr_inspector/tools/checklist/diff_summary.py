@@ -0,0 +1,261 @@
+"""AST-aware summarization of changes to Python files."""
+
+import ast
+import logging
+from dataclasses import dataclass
+
+from pr_inspector.services.github_service import HUNK_HEADER_PATTERN, GithubService, PrDetails, PrFile
+
+logger = logging.getLogger(__name__)
+
+MAX_LINES_PER_SYMBOL = 6
+MAX_LINES_PER_FILE = 40
+MODULE_LEVEL = "<module>"
+
+
+@dataclass
+class Symbol:
+    """A function or class definition in a Python file."""
+    qualified_name: str
+    kind: str  # "function" or "class"
+    signature: str
+    start_line: int
+    end_line: int
+    source: str
+
+
+@dataclass
+class ChangedLine:
+    """A line added or removed by a diff. Added lines are positioned by their
+    line in the new version of the file, removed lines by their line in the
+    old version."""
+    line_number: int
+    text: str  # Includes the leading "+" or "-".
+
+
+def summarize_python_files(
+    pr_details: PrDetails, github_service: GithubService, max_chars: int | None = None
+) -> None:
+    """
+    Attach a symbol-level summary to every changed Python file, within the
+    `max_chars` prompt budget, whose head version can be read from the blob
+    store.
+
+    The before version of a modified file is reconstructed by reverse-applying
+    its patch to the head version, so only the head blob is fetched.
+    """
+    pr_files = [
+        pr_file for pr_file in pr_details.files_within_budget(max_chars)
+        if pr_file.file_name.endswith(".py") and pr_file.file_diff is not None
+    ]
+    available = github_service.fetch_blobs(
+        pr_details.org_name,
+        pr_details.repo_name,
+        (pr_file.blob_sha for pr_file in pr_files if pr_file.status != "removed" and pr_file.blob_sha),
+    )
+    for pr_file in pr_files:
+        if pr_file.status == "removed":
+            after_source = ""
+        elif pr_file.blob_sha in available:
+            after_source = github_service.blob_store.read_text(pr_file.blob_sha)
+        else:
+            continue
+        try:
+            symbol_summary = summarize_python_change(pr_file, after_source)
+        except SyntaxError:
+            symbol_summary = None
+        if symbol_summary is None:
+            logger.info(f"Could not summarize {pr_file.file_name}, keeping the raw diff.")
+            continue
+        pr_file.symbol_summary = symbol_summary
+
+
+def summarize_python_change(pr_file: PrFile, after_source: str) -> list[str] | None:
+    """
+    Summarize a change to a Python file as the symbols it adds, removes and
+    modifies, with signature changes and the most relevant changed lines.
+
+    Args:
+        pr_file: The changed file, with its full patch
+        after_source: The head version of the file
+
+    Returns:
+        Rendered summary lines, or None if the patch does not apply to the
+        head version of the file
+    """
+    if pr_file.status == "added":
+        before_source = ""
+    else:
+        before_source = reverse_apply_patch(after_source, pr_file.file_diff)
+        if before_source is None:
+            return None
+    before_symbols = collect_symbols(before_source)
+    after_symbols = collect_symbols(after_source)
+    changed_lines = _parse_changed_lines(pr_file.file_diff)
+
+    lines_by_symbol: dict[str, list[ChangedLine]] = {}
+    for changed_line in changed_lines:
+        # Removed lines belong to the symbol they were removed from.
+        symbols = before_symbols if changed_line.text.startswith("-") else after_symbols
+        owner = _innermost_symbol(symbols, changed_line.line_number)
+        lines_by_symbol.setdefault(owner, []).append(changed_line)
+
+    summary = []
+    # Symbols whose changed lines the summary accounts for.
+    shown = {MODULE_LEVEL}
+    for name in sorted(after_symbols, key=lambda name: after_symbols[name].start_line):
+        symbol = after_symbols[name]
+        if name not in before_symbols:
+            summary.append(f"    + added {symbol.kind} `{symbol.signature}` (line {symbol.start_line})")
+            shown.add(name)
+            continue
+        previous = before_symbols[name]
+        if previous.source == symbol.source:
+            continue
+        own_lines = _render_changed_lines(lines_by_symbol.get(name, []))
+        if symbol.kind == "class" and previous.signature == symbol.signature and not own_lines:
+            # Only its methods changed, and those are listed on their own.
+            continue
+        summary.append(
+            f"    ~ modified {symbol.kind} `{name}` (lines {symbol.start_line}-{symbol.end_line})"
+        )
+        if previous.signature != symbol.signature:
+            summary.append(f"      signature: `{previous.signature}` -> `{symbol.signature}`")
+        summary.extend(own_lines)
+        shown.add(name)
+    for name in sorted(set(before_symbols) - set(after_symbols)):
+        summary.append(f"    - removed {before_symbols[name].kind} `{before_symbols[name].signature}`")
+        shown.add(name)
+    if lines_by_symbol.get(MODULE_LEVEL):
+        summary.append("    ~ module-level changes")
+        summary.extend(_render_changed_lines(lines_by_symbol[MODULE_LEVEL]))
+    # Anything the symbol comparison missed, so no change is silently dropped.
+    other_lines = _render_changed_lines([
+        changed_line
+        for name, owned_lines in lines_by_symbol.items() if name not in shown
+        for changed_line in owned_lines
+    ])
+    if other_lines:
+        summary.append("    ~ other changes")
+        summary.extend(other_lines)
+
+    if len(summary) > MAX_LINES_PER_FILE:
+        omitted = len(summary) - MAX_LINES_PER_FILE
+        summary = summary[:MAX_LINES_PER_FILE] + [f"    ... {omitted} more summary lines omitted"]
+    return summary
+
+
+def reverse_apply_patch(after_source: str, file_diff: str) -> str | None:
+    """Reconstruct the previous version of a file from its new version and
+    unified diff. Returns None if the patch does not match the new version."""
+    after_lines = after_source.splitlines()
+    before_lines: list[str] = []
+    cursor = 0  # Index into after_lines of the next line not yet copied.
+    diff_lines = file_diff.splitlines()
+    index = 0
+    while index < len(diff_lines):
+        match = HUNK_HEADER_PATTERN.match(diff_lines[index])
+        index += 1
+        if match is None:
+            continue
+        new_start = int(match.group(3))
+        new_length = int(match.group(4)) if match.group(4) is not None else 1
+        # A zero-length hunk's start is the line *before* the insertion point.
+        hunk_start = new_start if new_length == 0 else new_start - 1
+        before_lines.extend(after_lines[cursor:hunk_start])
+        cursor = hunk_start
+        while index < len(diff_lines) and not diff_lines[index].startswith("@@"):
+            line = diff_lines[index]
+            index += 1
+            if line.startswith("\\"):  # "\ No newline at end of file"
+                continue
+            marker, text = line[:1], line[1:]
+            if marker == "-":
+                before_lines.append(text)
+                continue
+            if cursor >= len(after_lines) or after_lines[cursor] != text:
+                return None
+            if marker != "+":
+                before_lines.append(text)
+            cursor += 1
+    before_lines.extend(after_lines[cursor:])
+    return "\n".join(before_lines) + "\n" if before_lines else ""
+
+
+def collect_symbols(source: str) -> dict[str, Symbol]:
+    """Collect the classes, functions and methods of a module by qualified
+    name. A symbol's lines and source include its decorators."""
+    tree = ast.parse(source)
+    source_lines = source.splitlines()
+    symbols: dict[str, Symbol] = {}
+
+    def visit(body: list[ast.stmt], prefix: str) -> None:
+        for node in body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind = "function"
+                returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+                signature = f"{prefix}{node.name}({ast.unparse(node.args)}){returns}"
+            elif isinstance(node, ast.ClassDef):
+                kind = "class"
+                bases = ", ".join(ast.unparse(base) for base in node.bases)
+                signature = f"{prefix}{node.name}({bases})" if bases else f"{prefix}{node.name}"
+            else:
+                continue
+            qualified_name = f"{prefix}{node.name}"
+            start_line = min([node.lineno] + [decorator.lineno for decorator in node.decorator_list])
+            symbols[qualified_name] = Symbol(
+                qualified_name=qualified_name,
+                kind=kind,
+                signature=signature,
+                start_line=start_line,
+                end_line=node.end_lineno,
+                source="\n".join(source_lines[start_line - 1:node.end_lineno]),
+            )
+            if isinstance(node, ast.ClassDef):
+                visit(node.body, f"{qualified_name}.")
+
+    visit(tree.body, "")
+    return symbols
+
+
+def _parse_changed_lines(file_diff: str) -> list[ChangedLine]:
+    changed_lines = []
+    old_line_number = new_line_number = 0
+    for line in file_diff.splitlines():
+        match = HUNK_HEADER_PATTERN.match(line)
+        if match is not None:
+            old_line_number = int(match.group(1))
+            new_line_number = int(match.group(3))
+            continue
+        if line.startswith("+"):
+            changed_lines.append(ChangedLine(new_line_number, line))
+            new_line_number += 1
+        elif line.startswith("-"):
+            changed_lines.append(ChangedLine(old_line_number, line))
+            old_line_number += 1
+        elif not line.startswith("\\"):
+            old_line_number += 1
+            new_line_number += 1
+    return changed_lines
+
+
+def _innermost_symbol(symbols: dict[str, Symbol], line_number: int) -> str:
+    containing = [
+        symbol for symbol in symbols.values()
+        if symbol.start_line <= line_number <= symbol.end_line
+    ]
+    if not containing:
+        return MODULE_LEVEL
+    return max(containing, key=lambda symbol: symbol.start_line).qualified_name
+
+
+def _render_changed_lines(changed_lines: list[ChangedLine]) -> list[str]:
+    # Blank and comment-only lines carry little signal for a reviewer.
+    relevant = [
+        changed_line for changed_line in changed_lines
+        if changed_line.text[1:].strip() and not changed_line.text[1:].strip().startswith("#")
+    ]
+    rendered = [f"      {changed_line.text.rstrip()}" for changed_line in relevant[:MAX_LINES_PER_SYMBOL]]
+    if len(relevant) > MAX_LINES_PER_SYMBOL:
+        rendered.append(f"      ... {len(relevant) - MAX_LINES_PER_SYMBOL} more changed lines")
+    return rendered
@@ -0,0 +1,360 @@
+"""Deterministic, LLM-free checklist built from the import graph and path rules."""
+
+import ast
+import posixpath
+import re
+from collections import defaultdict
+
+from pr_inspector.services.blob_store import BlobStore
+from pr_inspector.services.github_service import PrDetails, PrFile
+from pr_inspector.tools.checklist.models import (
+    ChecklistOutput,
+    Context,
+    CrossCuttingConcern,
+    CrossCuttingConcerns,
+    FileReviewOrder,
+    KeyFilesAndReviewOrder,
+    PerFileNote,
+    RiskOrTradeoff,
+    RisksAndTradeoffs,
+    TestingAndValidation,
+)
+
+# Matches import statements on added or unchanged lines of a unified diff.
+PATCH_IMPORT_PATTERN = re.compile(
+    r"^[ +]\s*(?:from\s+(\.*[\w.]*)\s+import\s+([\w., ]+)|import\s+([\w.]+))", re.MULTILINE
+)
+# The enclosing function/class git puts after a hunk header, e.g. "@@ -1,2 +1,3 @@ def foo():"
+HUNK_CONTEXT_PATTERN = re.compile(r"^@@ [^@]+ @@ ?(.+)$", re.MULTILINE)
+TEST_FILE_PATTERN = re.compile(r"(^|/)(tests?|__tests__|spec)/|(^|/)test_[^/]+$|_test\.\w+$|\.(test|spec)\.\w+$")
+
+# Path heuristics, in review order: foundations first, consumers next, tests last.
+PATH_CATEGORIES: list[tuple[str, re.Pattern, str]] = [
+    ("config", re.compile(r"(^|/)(settings|config)[^/]*$|\.(ya?ml|toml|ini|cfg|env)$"), "Configuration"),
+    ("migration", re.compile(r"(^|/)(migrations|alembic)/"), "Database migration"),
+    ("model", re.compile(r"(^|/)(models?|schemas?|types)(\.py|/)"), "Data models and schemas"),
+    ("service", re.compile(r"(^|/)(services?|core|lib|utils?)(\.py|/)"), "Core logic and services"),
+    ("interface", re.compile(r"(^|/)(api|views?|handlers?|routes?|tools?|cli|server)(\.py|/)"), "Entry points and interfaces"),
+    ("docs", re.compile(r"\.(md|rst|txt)$"), "Documentation"),
+]
+CATEGORY_RANK = {category: rank for rank, (category, _, _) in enumerate(PATH_CATEGORIES)}
+
+RISK_RULES: list[tuple[re.Pattern, str, str, str]] = [
+    (re.compile(r"(^|/)(migrations|alembic)/"), "fragile_area", "high",
+     "Database migration changed - check it is reversible and safe on existing data."),
+    # Whole words of the path only, so e.g. AUTHORS.md or tokenizer.py don't match.
+    (re.compile(
+        r"(^|[/_.-])(auth|authn|authz|authentication|authorization|oauth2?|login|logout|permissions?"
+        r"|tokens?|jwt|secrets?|credentials?|crypto|encryption|passwords?|passwd)(?=[/_.-]|$)",
+        re.IGNORECASE,
+    ), "security", "high",
+     "Authentication/authorization or secret-handling code changed."),
+    (re.compile(r"(^|/)(requirements[^/]*\.txt|pyproject\.toml|setup\.py|package\.json|[^/]*\.lock|go\.mod)$"), "maintainability", "medium",
+     "Dependency manifest changed - check new or upgraded dependencies."),
+    (re.compile(r"(^|/)\.github/workflows/|(^|/)(Dockerfile|docker-compose[^/]*|Makefile)$"), "fragile_area", "medium",
+     "Build or CI configuration changed."),
+    (re.compile(r"(^|/)(settings|config)[^/]*$|\.(ya?ml|toml|ini|cfg|env)$"), "fragile_area", "medium",
+     "Configuration changed - check defaults and every environment it is deployed to."),
+]
+
+
+def build_fast_checklist(pr_details: PrDetails, blob_store: BlobStore | None = None) -> ChecklistOutput:
+    """
+    Build a basic checklist locally, without calling an LLM.
+
+    Review order comes from the import graph between the changed Python files
+    (parsed from the head version of the file if it is already in the blob
+    store, otherwise from the import lines in the patch), with path heuristics
+    as a tie-breaker and for non-Python files. Tests are matched to changed
+    files by name, and risks are flagged by path rules.
+
+    Args:
+        pr_details: The PR details
+        blob_store: Optional blob store to read already-fetched file contents from
+
+    Returns:
+        ChecklistOutput built deterministically from the PR details
+    """
+    pr_files = pr_details.pr_files
+    dependencies = _build_dependency_graph(pr_files, blob_store)
+    review_order = _order_files(pr_files, dependencies)
+    test_files = [pr_file for pr_file in pr_files if _is_test_file(pr_file.file_name)]
+    source_files = [pr_file for pr_file in pr_files if not _is_test_file(pr_file.file_name)]
+    test_matches = _match_tests(source_files, test_files)
+
+    return ChecklistOutput(
+        key_files_and_review_order=KeyFilesAndReviewOrder(
+            files=[
+                FileReviewOrder(
+                    file_name=file_name,
+                    order=order,
+                    reason=_review_reason(file_name, dependencies[file_name]),
+                )
+                for order, file_name in enumerate(review_order, start=1)
+            ],
+            overall_approach=(
+                "Files are ordered so that each file comes after the changed files it imports, "
+                "starting from configuration and data models and ending with tests."
+            ),
+        ),
+        per_file_notes=[
+            PerFileNote(
+                file_name=pr_file.file_name,
+                purpose=_category_description(pr_file.file_name),
+                critical_sections=_changed_sections(pr_file),
+                pitfalls=["Diff too large to include; review the full file."] if pr_file.file_diff is None else [],
+                dependencies=sorted(dependencies[pr_file.file_name]),
+            )
+            for pr_file in pr_files
+        ],
+        cross_cutting_concerns=_find_cross_cutting_concerns(dependencies),
+        testing_and_validation=TestingAndValidation(
+            files_tests_covered=[
+                f"{test_file} covers {source_file}"
+                for source_file, matched_tests in test_matches.items()
+                for test_file in matched_tests
+            ],
+            missing_scenarios=[
+                f"No test changes for {source_file.file_name}"
+                for source_file in source_files
+                if not test_matches.get(source_file.file_name) and source_file.file_name.endswith(".py")
+            ],
+            manual_checks=[],
+        ),
+        risks_and_tradeoffs=_find_risks(pr_files),
+        context=Context(
+            background_assumptions=[f"PR title: {pr_details.pr_title}"],
+            constraints=[],
+            design_decisions=[],
+            style_conventions=[],
+            architectural_conventions=[],
+        ),
+    )
+
+
+def fast_checklist_digest(checklist: ChecklistOutput, max_chars: int) -> str:
+    """Summarize a fast checklist compactly for inclusion in the LLM prompt.
+    Lines past `max_chars` are dropped and counted instead."""
+    output = ["Suggested review order (from the import graph):"]
+    output.extend(
+        f"  {file_review.order}. {file_review.file_name}"
+        for file_review in checklist.key_files_and_review_order.files
+    )
+    testing = checklist.testing_and_validation
+    if testing.files_tests_covered:
+        output.append("Tests matched to changed files:")
+        output.extend(f"  - {entry}" for entry in testing.files_tests_covered)
+    if checklist.risks_and_tradeoffs.risks:
+        output.append("Rule-based risks:")
+        output.extend(
+            f"  - [{risk.severity}] {risk.description} ({', '.join(risk.affected_areas)})"
+            for risk in checklist.risks_and_tradeoffs.risks
+        )
+    used_chars = 0
+    for kept, line in enumerate(output):
+        used_chars += len(line) + 1
+        if used_chars > max_chars:
+            output = output[:kept] + [f"  ... ({len(output) - kept} more lines omitted)"]
+            break
+    return "\n".join(output)
+
+
+def _module_name(file_name: str) -> str | None:
+    if not file_name.endswith(".py"):
+        return None
+    module_path = file_name[:-3]
+    if module_path.endswith("/__init__"):
+        module_path = module_path[: -len("/__init__")]
+    return module_path.replace("/", ".")
+
+
+def _imported_modules(pr_file: PrFile, blob_store: BlobStore | None) -> set[str]:
+    """Absolute names of the modules (and `from x import y` candidates) a Python file imports."""
+    package = (_module_name(pr_file.file_name) or "").rsplit(".", 1)[0]
+    if pr_file.file_name.endswith("/__init__.py"):
+        package = _module_name(pr_file.file_name) or ""
+
+    source = None
+    if blob_store is not None and pr_file.blob_sha is not None and blob_store.contains(pr_file.blob_sha):
+        source = blob_store.read_text(pr_file.blob_sha)
+    imports: list[tuple[int, str, list[str]]] = []  # (relative level, module, imported names)
+    if source is not None:
+        try:
+            for node in ast.walk(ast.parse(source)):
+                if isinstance(node, ast.Import):
+                    imports.extend((0, alias.name, []) for alias in node.names)
+                elif isinstance(node, ast.ImportFrom):
+                    imports.append((node.level, node.module or "", [alias.name for alias in node.names]))
+        except SyntaxError:
+            source = None
+    if source is None:
+        for match in PATCH_IMPORT_PATTERN.finditer(pr_file.file_diff or ""):
+            if match.group(3):
+                imports.append((0, match.group(3), []))
+            else:
+                dotted = match.group(1)
+                level = len(dotted) - len(dotted.lstrip("."))
+                names = [name.strip() for name in match.group(2).split(",")]
+                imports.append((level, dotted.lstrip("."), names))
+
+    modules = set()
+    for level, module, names in imports:
+        if level > 0:
+            base_parts = package.split(".") if package else []
+            base_parts = base_parts[: len(base_parts) - (level - 1)]
+            module = ".".join(base_parts + ([module] if module else []))
+        modules.add(module)
+        modules.update(f"{module}.{name}" for name in names if name != "*")
+    return modules
+
+
+def _build_dependency_graph(pr_files: list[PrFile], blob_store: BlobStore | None) -> dict[str, set[str]]:
+    """Map each changed file to the other changed files it imports."""
+    modules_to_files: dict[str, str] = {}
+    for pr_file in pr_files:
+        module_name = _module_name(pr_file.file_name)
+        if module_name is not None:
+            modules_to_files[module_name] = pr_file.file_name
+            # Also match imports that omit a top-level source directory like "src/".
+            if "." in module_name:
+                modules_to_files.setdefault(module_name.split(".", 1)[1], pr_file.file_name)
+
+    dependencies: dict[str, set[str]] = {pr_file.file_name: set() for pr_file in pr_files}
+    for pr_file in pr_files:
+        if not pr_file.file_name.endswith(".py"):
+            continue
+        for module in _imported_modules(pr_file, blob_store):
+            target = modules_to_files.get(module)
+            if target is not None and target != pr_file.file_name:
+                dependencies[pr_file.file_name].add(target)
+    return dependencies
+
+
+def _category(file_name: str) -> str | None:
+    if _is_test_file(file_name):
+        return "test"
+    for category, pattern, _ in PATH_CATEGORIES:
+        if pattern.search(file_name):
+            return category
+    return None
+
+
+def _category_description(file_name: str) -> str:
+    category = _category(file_name)
+    if category == "test":
+        return "Tests"
+    for known_category, _, description in PATH_CATEGORIES:
+        if known_category == category:
+            return description
+    return "Source file"
+
+
+def _path_rank(file_name: str) -> tuple[int, str]:
+    category = _category(file_name)
+    if category == "test":
+        rank = len(PATH_CATEGORIES) + 1
+    elif category is None:
+        rank = CATEGORY_RANK["service"]
+    else:
+        rank = CATEGORY_RANK[category]
+    return rank, file_name
+
+
+def _order_files(pr_files: list[PrFile], dependencies: dict[str, set[str]]) -> list[str]:
+    """Topologically order files so dependencies come first, breaking ties
+    (and cycles) by path heuristics."""
+    remaining = {pr_file.file_name: set(dependencies[pr_file.file_name]) for pr_file in pr_files}
+    order = []
+    while remaining:
+        ready = [file_name for file_name, deps in remaining.items() if not deps]
+        if not ready:
+            # Import cycle: break it at the file that ranks earliest by path.
+            ready = [min(remaining, key=_path_rank)]
+        next_file = min(ready, key=_path_rank)
+        order.append(next_file)
+        del remaining[next_file]
+        for deps in remaining.values():
+            deps.discard(next_file)
+    return order
+
+
+def _review_reason(file_name: str, file_dependencies: set[str]) -> str:
+    reason = _category_description(file_name)
+    if file_dependencies:
+        reason += f"; imports {', '.join(sorted(file_dependencies))}"
+    return reason
+
+
+def _changed_sections(pr_file: PrFile) -> list[str]:
+    sections = []
+    for match in HUNK_CONTEXT_PATTERN.finditer(pr_file.file_diff or ""):
+        section = match.group(1).strip()
+        if section and section not in sections:
+            sections.append(section)
+    return sections
+
+
+def _is_test_file(file_name: str) -> bool:
+    return bool(TEST_FILE_PATTERN.search(file_name))
+
+
+def _test_subject(test_file_name: str) -> str:
+    """The name of the module a test file is most likely testing, e.g. "foo" for tests/test_foo.py."""
+    stem = posixpath.splitext(posixpath.basename(test_file_name))[0]
+    stem = re.sub(r"^test_|_test$|\.(test|spec)$", "", stem)
+    return stem
+
+
+def _match_tests(source_files: list[PrFile], test_files: list[PrFile]) -> dict[str, list[str]]:
+    tests_by_subject: dict[str, list[str]] = defaultdict(list)
+    for test_file in test_files:
+        tests_by_subject[_test_subject(test_file.file_name)].append(test_file.file_name)
+    return {
+        source_file.file_name: tests_by_subject.get(
+            posixpath.splitext(posixpath.basename(source_file.file_name))[0], []
+        )
+        for source_file in source_files
+    }
+
+
+def _find_cross_cutting_concerns(dependencies: dict[str, set[str]]) -> CrossCuttingConcerns:
+    dependents: dict[str, list[str]] = defaultdict(list)
+    for file_name, file_dependencies in dependencies.items():
+        for dependency in file_dependencies:
+            dependents[dependency].append(file_name)
+    concerns = [
+        CrossCuttingConcern(
+            concern_type="shared dependency",
+            description=f"{dependency} is changed and imported by {len(importers)} other changed files.",
+            affected_files=[dependency] + sorted(importers),
+            consistency_notes="Check every importer is updated for changes to its interface.",
+        )
+        for dependency, importers in sorted(dependents.items())
+        if len(importers) >= 2
+    ]
+    summary = (
+        f"Changed files imported by several other changed files: {len(concerns)}."
+        if concerns else "No changed file is shared by several other changed files."
+    )
+    return CrossCuttingConcerns(concerns=concerns, summary=summary)
+
+
+def _find_risks(pr_files: list[PrFile]) -> RisksAndTradeoffs:
+    risks = []
+    for pattern, category, severity, description in RISK_RULES:
+        affected = [pr_file.file_name for pr_file in pr_files if pattern.search(pr_file.file_name)]
+        if affected:
+            risks.append(RiskOrTradeoff(
+                description=description, category=category, severity=severity, affected_areas=affected,
+            ))
+    deleted_tests = [
+        pr_file.file_name for pr_file in pr_files
+        if pr_file.status == "removed" and _is_test_file(pr_file.file_name)
+    ]
+    if deleted_tests:
+        risks.append(RiskOrTradeoff(
+            description="Tests were deleted - check the coverage they provided is not lost.",
+            category="maintainability", severity="high", affected_areas=deleted_tests,
+        ))
+    summary = f"{len(risks)} rule-based risks flagged." if risks else "No rule-based risks flagged."
+    return RisksAndTradeoffs(risks=risks, summary=summary)
@@ -1,7 +1,10 @@
 from langchain_core.prompts import PromptTemplate
 
-checklist_prompt_template = PromptTemplate(
-    input_variables=["checklist_template", "pr_details"],
+# The prompt is split around the PR details so that the (potentially very
+# large) PR details can be streamed straight into the prompt buffer instead
+# of being formatted into the template as one more full-size copy.
+checklist_prompt_header_template = PromptTemplate(
+    input_variables=["checklist_template", "repo_profile", "static_analysis"],
     template="""
 You are an expert code reviewer. Generate a comprehensive checklist.
 
@@ -13,14 +16,37 @@ CHECKLIST TEMPLATE
 
 {checklist_template}
 
+##################
+REPOSITORY PROFILE
+##################
+
+Conventions and layout of the repository's default branch. Use these to
+ground the Context and Testing & Validation sections:
+
+{repo_profile}
+
+##################
+STATIC ANALYSIS
+##################
+
+Computed from the import graph of the changed files and path rules. Use it
+as a starting point for Key Files & Review Order and Risks & Tradeoffs
+instead of rederiving it:
+
+{static_analysis}
+
 ##################
 PR DETAILS
 ##################
 
-The details of the pull request are as follows:
+The details of the pull request are as follows. For Python files, "Symbols
+Changed" lists the functions and classes the diff adds, removes or modifies;
+use those names for the critical sections of each file.
 
-{pr_details}
+"""
+)
 
+checklist_prompt_instructions = """
 ##################
 INSTRUCTIONS
 ##################
@@ -30,7 +56,6 @@ Please generate a checklist of items that should be reviewed for the pull reques
 Return ONLY valid JSON, no markdown or extra text. Generate the checklist
 matching the required schema exactly.
     """
-)
 
 checklist_template = """
 - [ ] **Key Files & Review Order**  
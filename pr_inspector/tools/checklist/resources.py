@@ -0,0 +1,38 @@
+"""MCP resources exposing generated checklists."""
+
+from fastmcp.exceptions import ResourceError
+
+from pr_inspector.mcp_instance import mcp
+from pr_inspector.tools.checklist.store import get_checklist_store
+
+
+@mcp.resource(
+    "checklist://{org_name}/{repo_name}/{pr_number}@{head_sha}",
+    mime_type="text/markdown",
+)
+def get_checklist(org_name: str, repo_name: str, pr_number: int, head_sha: str) -> str:
+    """The checklist generated for a PR at a specific head SHA."""
+    checklist = get_checklist_store().get(org_name, repo_name, pr_number, head_sha)
+    if checklist is None:
+        raise ResourceError(
+            f"No checklist generated yet for {org_name}/{repo_name}#{pr_number}@{head_sha}. "
+            "Call create_pr_checklist first."
+        )
+    return checklist
+
+
+@mcp.resource(
+    "checklist://{org_name}/{repo_name}/{pr_number}",
+    mime_type="text/markdown",
+)
+def get_latest_checklist(org_name: str, repo_name: str, pr_number: int) -> str:
+    """The most recent checklist generated for a PR. Listen for updates to
+    this URI (`subscriptions/listen`) to be notified when a new head SHA
+    produces an updated checklist."""
+    checklist = get_checklist_store().get_latest(org_name, repo_name, pr_number)
+    if checklist is None:
+        raise ResourceError(
+            f"No checklist generated yet for {org_name}/{repo_name}#{pr_number}. "
+            "Call create_pr_checklist first."
+        )
+    return checklist
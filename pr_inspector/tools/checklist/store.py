@@ -0,0 +1,93 @@
+"""In-memory store of generated checklists, publishing change events."""
+
+import logging
+import threading
+from collections import OrderedDict
+
+import anyio.from_thread
+from mcp.server.subscriptions import ResourceUpdated, SubscriptionBus
+
+from pr_inspector.mcp_instance import subscription_bus
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHED_CHECKLISTS = 256
+
+
+def checklist_uri(org_name: str, repo_name: str, pr_number: int, head_sha: str | None = None) -> str:
+    """Build the resource URI of a checklist. Without a head SHA, the URI
+    refers to the latest checklist generated for the PR."""
+    uri = f"checklist://{org_name}/{repo_name}/{pr_number}"
+    if head_sha is not None:
+        uri += f"@{head_sha}"
+    return uri
+
+
+class ChecklistStore:
+    """Generated checklists keyed by PR and head SHA.
+
+    A checklist for a given head SHA never changes, so it can be served
+    straight from the store. Whenever a checklist for a new head SHA is
+    stored, a resource-updated event for the PR's latest-checklist URI is
+    published on the subscription bus, reaching clients listening for it.
+    """
+
+    def __init__(self, bus: SubscriptionBus | None = None, max_entries: int = MAX_CACHED_CHECKLISTS):
+        self.bus = bus
+        self.max_entries = max_entries
+        self._checklists: OrderedDict[str, str] = OrderedDict()
+        self._latest: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, org_name: str, repo_name: str, pr_number: int, head_sha: str) -> str | None:
+        uri = checklist_uri(org_name, repo_name, pr_number, head_sha)
+        with self._lock:
+            checklist = self._checklists.get(uri)
+            if checklist is not None:
+                self._checklists.move_to_end(uri)
+            return checklist
+
+    def get_latest(self, org_name: str, repo_name: str, pr_number: int) -> str | None:
+        with self._lock:
+            head_sha = self._latest.get(checklist_uri(org_name, repo_name, pr_number))
+        if head_sha is None:
+            return None
+        return self.get(org_name, repo_name, pr_number, head_sha)
+
+    def put(self, org_name: str, repo_name: str, pr_number: int, head_sha: str, checklist: str) -> None:
+        """Store a checklist and publish an update if it is for a new head SHA."""
+        latest_uri = checklist_uri(org_name, repo_name, pr_number)
+        with self._lock:
+            self._checklists[checklist_uri(org_name, repo_name, pr_number, head_sha)] = checklist
+            while len(self._checklists) > self.max_entries:
+                self._checklists.popitem(last=False)
+            is_new_head = self._latest.get(latest_uri) != head_sha
+            self._latest[latest_uri] = head_sha
+        if is_new_head:
+            self._publish(latest_uri)
+
+    def _publish(self, uri: str) -> None:
+        if self.bus is None:
+            return
+        # Checklists are stored from the worker threads sync tools run on, and
+        # the bus must be driven from the server's event loop.
+        try:
+            anyio.from_thread.run(self.bus.publish, ResourceUpdated(uri=uri))
+        except RuntimeError:
+            # Not called from a server worker thread, so nobody can be listening.
+            logger.debug(f"Not publishing update for {uri} outside the server.")
+
+
+# Provider function for dependency injection
+_checklist_store_instance: ChecklistStore | None = None
+_checklist_store_lock = threading.Lock()
+
+
+def get_checklist_store() -> ChecklistStore:
+    """Dependency provider for the checklist store."""
+    global _checklist_store_instance
+    if _checklist_store_instance is None:
+        with _checklist_store_lock:
+            if _checklist_store_instance is None:
+                _checklist_store_instance = ChecklistStore(bus=subscription_bus)
+    return _checklist_store_instance
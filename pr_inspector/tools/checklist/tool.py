@@ -1,38 +1,126 @@
 """Tool for creating PR review checklists."""
 
-import json
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
 
+from fastmcp import Context
 from fastmcp.dependencies import Depends
+from fastmcp.server.dependencies import get_access_token, get_http_headers, get_http_request
 
+from pr_inspector.admission import (
+    AdmissionController,
+    DEFAULT_PRIORITY,
+    PRIORITY_WEIGHTS,
+    ServerBusyError,
+    charge_tokens,
+    get_admission_controller,
+)
+
+from pr_inspector.config import (
+    get_admission_config,
+    get_blob_store_config,
+    get_checklist_config,
+    get_ingestion_config,
+    get_repo_profile_config,
+)
 from pr_inspector.mcp_instance import mcp
+from pr_inspector.profiling import profile_request, profile_worker_thread
 from pr_inspector.services.github_service import (
     GithubService,
     get_github_service,
+    parse_pr_link,
     PrDetails,
 )
+from pr_inspector.services.repo_profile_service import (
+    RepoProfileService,
+    get_repo_profile_service,
+)
 from pr_inspector.services.llm_service import (
+    CHARS_PER_TOKEN,
+    LLM_PROVIDER_ERRORS,
+    estimate_tokens,
     LLMService,
+    get_context_window_tokens,
     get_llm_service,
     DEFAULT_MODEL,
 )
+from pr_inspector.tools.checklist.diff_summary import summarize_python_files
+from pr_inspector.tools.checklist.fast_checklist import build_fast_checklist, fast_checklist_digest
 from pr_inspector.tools.checklist.models import ChecklistOutput
-from pr_inspector.tools.checklist.prompt import checklist_prompt_template, checklist_template
+from pr_inspector.tools.checklist.store import ChecklistStore, get_checklist_store
+from pr_inspector.tools.checklist.prompt import (
+    checklist_prompt_header_template,
+    checklist_prompt_instructions,
+    checklist_template,
+)
+
+logger = logging.getLogger(__name__)
+
+GENERATION_MODES = ("single", "sectional", "fast")
+
+DEGRADED_NOTICE = (
+    "> **Note:** The LLM provider is unavailable or returned an error, so this is "
+    "a basic checklist generated from the import graph and path rules only.\n\n"
+)
+PARTIALLY_DEGRADED_NOTICE = (
+    "> **Note:** The LLM provider failed to generate some sections, so these are "
+    "generated from the import graph and path rules only: {sections}.\n\n"
+)
+SECTION_TITLES = {
+    "key_files_and_review_order": "Key Files & Review Order",
+    "per_file_notes": "Per-File Notes",
+    "cross_cutting_concerns": "Cross-Cutting Concerns",
+    "testing_and_validation": "Testing & Validation",
+    "risks_and_tradeoffs": "Risks & Tradeoffs",
+    "context": "Context",
+}
+
 
+def generate_prompt(
+    pr_details: PrDetails,
+    max_chars: int | None = None,
+    repo_profile_digest: str | None = None,
+    static_analysis_digest: str | None = None,
+) -> str:
+    """
+    Generate the prompt from the checklist template and PR details.
+
+    The PR details are streamed line by line into the prompt buffer rather
+    than first rendered to a string of their own; `getvalue()` then makes
+    the returned copy.
 
-def generate_prompt(pr_details: PrDetails) -> str:
-    """Generate the prompt by formatting the template with checklist template and PR details."""
-    pr_details_str = str(pr_details)
-    return checklist_prompt_template.format(
+    Args:
+        pr_details: The PR details to include in the prompt
+        max_chars: Optional budget on the size of the rendered PR details
+        repo_profile_digest: Optional digest of the repository's conventions
+        static_analysis_digest: Optional digest of the fast, LLM-free checklist
+    """
+    buffer = io.StringIO()
+    buffer.write(checklist_prompt_header_template.format(
         checklist_template=checklist_template,
-        pr_details=pr_details_str
-    )
+        repo_profile=repo_profile_digest or "(No repository profile available)",
+        static_analysis=static_analysis_digest or "(No static analysis available)",
+    ))
+    pr_details.write_to(buffer, max_chars=max_chars)
+    buffer.write(checklist_prompt_instructions)
+    return buffer.getvalue()
+
+
+def get_prompt_budget_chars(model: str, context_fraction: float) -> int:
+    """Size budget, in characters, for the PR details in a prompt: a fraction
+    of the model's input context window, leaving room for the rest of the
+    prompt."""
+    return int(get_context_window_tokens(model) * context_fraction) * CHARS_PER_TOKEN
 
 
 def generate_response(
     prompt: str,
     llm_service: LLMService,
     model: str | None,
-) -> ChecklistOutput:
+    mode: str = "single",
+    fallback: ChecklistOutput | None = None,
+) -> tuple[ChecklistOutput, list[str]]:
     """
     Generate a structured response from the LLM using the ChecklistOutput Pydantic model.
     
@@ -40,26 +128,74 @@ def generate_response(
         prompt: The prompt to send to the LLM
         llm_service: The LLM service instance
         model: Model name to use (defaults to DEFAULT_MODEL if None)
+        mode: "single" to generate the whole checklist in one completion, or
+            "sectional" to generate each section in its own concurrent call
+        fallback: In sectional mode, a checklist to take the sections that
+            fail to generate from
     
     Returns:
-        ChecklistOutput instance parsed from LLM response
+        ChecklistOutput instance parsed from LLM response, and the names of
+        the sections taken from `fallback` instead
     """
     if model is None:
         model = DEFAULT_MODEL
+    if mode == "sectional":
+        return generate_sectional_response(prompt, llm_service, model, fallback)
 
-    # Pass the Pydantic model class directly - litellm handles schema conversion
-    response = llm_service.chat_completion(
+    # Validates straight from the JSON string, re-requesting only the
+    # sections that fail validation.
+    output = llm_service.structured_completion(
         messages=[{"role": "user", "content": prompt}],
+        response_format=ChecklistOutput,
         model=model,
-        response_format=ChecklistOutput  # litellm handles schema conversion automatically
     )
+    return output, []
+
+
+def generate_sectional_response(
+    prompt: str,
+    llm_service: LLMService,
+    model: str,
+    fallback: ChecklistOutput | None = None,
+) -> tuple[ChecklistOutput, list[str]]:
+    """
+    Generate each checklist section as its own smaller structured call, all
+    running concurrently, and merge the results into one ChecklistOutput.
     
-    # Extract content from litellm response (same structure as OpenAI)
-    content: str = response.choices[0].message.content
-    
-    # Parse JSON and create ChecklistOutput instance
-    json_data = json.loads(content)
-    return ChecklistOutput(**json_data)
+    Latency is bounded by the slowest section instead of the time to stream
+    the whole checklist in one completion. A section that fails is taken
+    from `fallback`, if given, so the sections that succeeded are kept, and
+    its name is returned alongside the checklist; if every section fails,
+    the first error is raised.
+    """
+    field_names = list(ChecklistOutput.model_fields)
+    with ThreadPoolExecutor(max_workers=len(field_names), initializer=profile_worker_thread) as executor:
+        futures = {
+            field_name: executor.submit(
+                llm_service.request_section,
+                messages=[{"role": "user", "content": prompt}],
+                response_format=ChecklistOutput,
+                field_name=field_name,
+                model=model,
+            )
+            for field_name in field_names
+        }
+        sections = {}
+        degraded_sections = []
+        errors = []
+        for field_name, future in futures.items():
+            try:
+                sections[field_name] = future.result()
+            except LLM_PROVIDER_ERRORS as e:
+                if fallback is None:
+                    raise
+                logger.warning(f"Section {field_name} failed, using the fast checklist's: {e}")
+                sections[field_name] = getattr(fallback, field_name)
+                degraded_sections.append(field_name)
+                errors.append(e)
+    if len(errors) == len(futures):
+        raise errors[0]
+    return ChecklistOutput(**sections), degraded_sections
 
 
 def transform_response_to_markdown(response: ChecklistOutput) -> str:
@@ -166,6 +302,10 @@ def _create_pr_checklist_impl(
     pr_url: str,
     github_service: GithubService,
     llm_service: LLMService,
+    repo_profile_service: RepoProfileService | None = None,
+    debug_profile: bool = False,
+    mode: str | None = None,
+    checklist_store: ChecklistStore | None = None,
 ) -> str:
     """
     Creates a comprehensive code review checklist customized for a specific GitHub PR.
@@ -179,30 +319,179 @@ def _create_pr_checklist_impl(
         pr_url: Full GitHub PR URL (e.g., "https://github.com/owner/repo/pull/123")
         github_service: Injected GitHub service (not part of MCP signature)
         llm_service: Injected LLM service (not part of MCP signature)
+        repo_profile_service: Injected repo profile service (not part of MCP signature)
+        debug_profile: Profile this request and write the results to the
+            configured profiling output directory
+        mode: Generation mode ("single", "sectional" or "fast"), defaults to
+            the configured checklist.generation_mode
+        checklist_store: Injected checklist store (not part of MCP signature).
+            A checklist already generated for the PR's head SHA is returned
+            from the store, and new checklists are published to it.
     
     Returns:
         Markdown-formatted checklist string, or error message if fetch fails
     """
-    pr_details: PrDetails = github_service.fetch_pr_details(pr_url)
-    prompt: str = generate_prompt(pr_details)
-    output: ChecklistOutput = generate_response(
+    if mode is None:
+        mode = get_checklist_config()["generation_mode"]
+    if mode not in GENERATION_MODES:
+        return f"Unknown mode '{mode}'. Expected one of: {', '.join(GENERATION_MODES)}."
+    with profile_request(f"create_pr_checklist_{pr_url}", debug_profile):
+        pull_request = github_service.fetch_pull_request(pr_url)
+        org_name, repo_name, pr_number = parse_pr_link(pr_url)
+        head_sha: str = pull_request.head.sha
+        if checklist_store is not None:
+            cached = checklist_store.get(org_name, repo_name, pr_number, head_sha)
+            if cached is not None:
+                return cached
+
+        ingestion_config = get_ingestion_config()
+        max_request_bytes: int = ingestion_config["max_request_mb"] * 1024 * 1024
+        pr_details: PrDetails = github_service.fetch_pr_details(
+            pr_url, max_request_bytes=max_request_bytes, pull_request=pull_request
+        )
+        if mode == "fast":
+            return transform_response_to_markdown(
+                build_fast_checklist(pr_details, github_service.blob_store)
+            )
+
+        if llm_service.circuit_breaker.is_open():
+            # Skip the preparation only the LLM prompt needs (blob fetches,
+            # summaries, the repo profile) when the LLM won't be called anyway.
+            logger.info("LLM circuit breaker is open, returning the fast checklist.")
+            return DEGRADED_NOTICE + transform_response_to_markdown(
+                build_fast_checklist(pr_details, github_service.blob_store)
+            )
+
+        max_prompt_chars: int = get_prompt_budget_chars(DEFAULT_MODEL, ingestion_config["prompt_context_fraction"])
+        # Summarize first: summarized files don't need surrounding context.
+        summarize_python_files(pr_details, github_service, max_chars=max_prompt_chars)
+        github_service.attach_surrounding_context(
+            pr_details,
+            context_lines=get_blob_store_config()["context_lines"],
+            max_chars=max_prompt_chars,
+        )
+        fast_output: ChecklistOutput = build_fast_checklist(pr_details, github_service.blob_store)
+        try:
+            output, degraded_sections = _generate_llm_checklist(
+                pr_details, fast_output, llm_service, repo_profile_service, mode, max_prompt_chars
+            )
+        except LLM_PROVIDER_ERRORS as e:
+            logger.warning(f"LLM checklist generation failed, falling back to fast checklist: {e}")
+            return DEGRADED_NOTICE + transform_response_to_markdown(fast_output)
+        markdown = transform_response_to_markdown(output)
+        if degraded_sections:
+            # Not stored, so the next request retries the failed sections.
+            sections = ", ".join(SECTION_TITLES[field_name] for field_name in degraded_sections)
+            return PARTIALLY_DEGRADED_NOTICE.format(sections=sections) + markdown
+        if checklist_store is not None:
+            checklist_store.put(org_name, repo_name, pr_number, head_sha, markdown)
+        return markdown
+
+
+def _generate_llm_checklist(
+    pr_details: PrDetails,
+    fast_output: ChecklistOutput,
+    llm_service: LLMService,
+    repo_profile_service: RepoProfileService | None,
+    mode: str,
+    max_prompt_chars: int,
+) -> tuple[ChecklistOutput, list[str]]:
+    repo_profile_digest: str | None = None
+    repo_profile_config = get_repo_profile_config()
+    if repo_profile_service is not None and repo_profile_config["enabled"]:
+        repo_profile = repo_profile_service.get_profile(pr_details.org_name, pr_details.repo_name)
+        if repo_profile is not None:
+            repo_profile_digest = repo_profile.to_digest(repo_profile_config["digest_max_chars"])
+    prompt: str = generate_prompt(
+        pr_details,
+        max_chars=max_prompt_chars,
+        repo_profile_digest=repo_profile_digest,
+        static_analysis_digest=fast_checklist_digest(
+            fast_output, get_checklist_config()["static_analysis_max_chars"]
+        ),
+    )
+    # Sectional mode sends the prompt once per section.
+    calls = len(ChecklistOutput.model_fields) if mode == "sectional" else 1
+    charge_tokens(estimate_tokens(prompt) * calls)
+    return generate_response(
         prompt=prompt,
         llm_service=llm_service,
         model=DEFAULT_MODEL,
+        mode=mode,
+        fallback=fast_output,
     )
-    return transform_response_to_markdown(output)
+
+
+def get_client_id(ctx: Context | None) -> str:
+    """
+    Identify the calling client for admission control.
+
+    Session IDs are not used: over stateless HTTP every call gets a new one.
+    In order of preference, the identity is the authenticated token's client,
+    the configured client ID header, the client ID the client reports, or
+    the remote address.
+    """
+    access_token = get_access_token()
+    if access_token is not None and access_token.client_id:
+        return f"token:{access_token.client_id}"
+    header_name = get_admission_config()["client_id_header"].lower()
+    header_value = get_http_headers(include={header_name}).get(header_name)
+    if header_value:
+        return f"header:{header_value}"
+    if ctx is not None and ctx.client_id:
+        return f"client:{ctx.client_id}"
+    try:
+        request = get_http_request()
+    except RuntimeError:
+        request = None
+    if request is not None and request.client is not None:
+        return f"address:{request.client.host}"
+    return "anonymous"
 
 
 @mcp.tool()
 def create_pr_checklist(
     pr_url: str,
+    mode: str | None = None,
+    priority: str = DEFAULT_PRIORITY,
+    debug_profile: bool = False,
+    ctx: Context | None = None,
     github_service: GithubService = Depends(get_github_service),
     llm_service: LLMService = Depends(get_llm_service),
+    repo_profile_service: RepoProfileService = Depends(get_repo_profile_service),
+    checklist_store: ChecklistStore = Depends(get_checklist_store),
+    admission_controller: AdmissionController = Depends(get_admission_controller),
 ) -> str:
-    """Generate a comprehensive code review checklist for a specific GitHub PR."""
-    return _create_pr_checklist_impl(pr_url, github_service, llm_service)
+    """Generate a comprehensive code review checklist for a specific GitHub PR.
+
+    Set `mode` to "sectional" to generate the checklist sections concurrently,
+    or "fast" for an instant LLM-free checklist from the import graph and path
+    rules (defaults to the server's configured mode). Set `debug_profile` to write a
+    profile and allocation summary for this request.
+
+    Generated checklists are also published as resources at
+    `checklist://{org}/{repo}/{pr_number}@{head_sha}` and, for the latest
+    head SHA, `checklist://{org}/{repo}/{pr_number}`.
+
+    Set `priority` to "interactive" (default), "batch" or "prefetch". Requests
+    are queued fairly per client and priority; when the server is saturated
+    or the client is over its quota, a "Server busy" message is returned.
+    """
+    if priority not in PRIORITY_WEIGHTS:
+        return f"Unknown priority '{priority}'. Expected one of: {', '.join(PRIORITY_WEIGHTS)}."
+    client_id = get_client_id(ctx)
+    try:
+        with admission_controller.admit(client_id, priority):
+            return _create_pr_checklist_impl(
+                pr_url, github_service, llm_service, repo_profile_service, debug_profile, mode, checklist_store
+            )
+    except ServerBusyError as e:
+        logger.info(f"Shed {priority} request from {client_id}: {e}")
+        return e.to_result()
 
 if __name__ == "__main__":
     pr_url = "https://github.com/METResearchGroup/bluesky-research/pull/273"
-    markdown_response = _create_pr_checklist_impl(pr_url, get_github_service(), get_llm_service())
+    markdown_response = _create_pr_checklist_impl(
+        pr_url, get_github_service(), get_llm_service(), get_repo_profile_service()
+    )
     print(markdown_response)
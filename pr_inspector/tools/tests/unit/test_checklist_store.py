@@ -0,0 +1,32 @@
+"""Unit tests for the checklist store and its update events."""
+
+import anyio
+from fastmcp import Client
+from mcp.client.subscriptions import listen
+
+from pr_inspector.mcp_instance import mcp, subscription_bus
+from pr_inspector.tools.checklist.store import ChecklistStore
+
+
+def test_put_publishes_update_to_listening_client():
+    uri = "checklist://org/repo/1"
+    store = ChecklistStore(bus=subscription_bus)
+
+    async def run():
+        async with Client(mcp) as client:
+            async with listen(client.session, resource_subscriptions=[uri]) as subscription:
+                # Checklists are stored from the worker threads tools run on.
+                await anyio.to_thread.run_sync(lambda: store.put("org", "repo", 1, "abc", "checklist"))
+                with anyio.fail_after(5):
+                    async for event in subscription:
+                        return event.uri
+
+    assert anyio.run(run) == uri
+    assert store.get_latest("org", "repo", 1) == "checklist"
+
+
+def test_put_outside_server_still_stores():
+    store = ChecklistStore()
+    store.put("org", "repo", 2, "abc", "checklist")
+
+    assert store.get_latest("org", "repo", 2) == "checklist"
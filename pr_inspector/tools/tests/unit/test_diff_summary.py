@@ -0,0 +1,103 @@
+"""Unit tests for the AST-aware Python change summaries."""
+
+from pr_inspector.services.github_service import PrFile
+from pr_inspector.tools.checklist.diff_summary import (
+    collect_symbols,
+    reverse_apply_patch,
+    summarize_python_change,
+)
+
+BEFORE = '''import os
+
+
+@require_login
+def handler(request):
+    return render(request)
+
+
+def helper(value):
+    return value
+'''
+
+AFTER = '''import os
+
+
+@require_login
+@require_admin
+def handler(request):
+    return render(request)
+
+
+def helper(value):
+    return value
+'''
+
+DECORATOR_DIFF = '''@@ -3,3 +3,4 @@ import os
+ 
+ @require_login
++@require_admin
+ def handler(request):
+'''
+
+
+def test_reverse_apply_patch_restores_previous_version():
+    assert reverse_apply_patch(AFTER, DECORATOR_DIFF) == BEFORE
+
+
+def test_reverse_apply_patch_rejects_mismatched_patch():
+    after = AFTER.replace("@require_admin", "@require_staff")
+
+    assert reverse_apply_patch(after, DECORATOR_DIFF) is None
+
+
+def test_reverse_apply_patch_zero_length_hunk():
+    # Pure removal: the new side has no lines, and its start is the line before.
+    after = "a\nc\n"
+    diff = "@@ -2,1 +1,0 @@\n-b\n"
+
+    assert reverse_apply_patch(after, diff) == "a\nb\nc\n"
+
+
+def test_symbol_source_includes_decorators():
+    symbol = collect_symbols(AFTER)["handler"]
+
+    assert symbol.start_line == 4
+    assert symbol.source.startswith("@require_login\n@require_admin\n")
+
+
+def test_decorator_only_change_is_summarized():
+    summary = summarize_python_change(PrFile("app.py", DECORATOR_DIFF, status="modified"), AFTER)
+
+    assert summary == [
+        "    ~ modified function `handler` (lines 4-7)",
+        "      +@require_admin",
+    ]
+
+
+def test_removed_function_lines_are_not_attributed_to_the_next_symbol():
+    after = "def kept():\n    return 1\n"
+    diff = "@@ -1,4 +1,2 @@\n-def gone():\n-    return 0\n def kept():\n     return 1\n"
+
+    summary = summarize_python_change(PrFile("app.py", diff, status="modified"), after)
+
+    assert summary == ["    - removed function `gone()`"]
+
+
+def test_removed_file_lists_removed_symbols_and_module_code():
+    diff = "@@ -1,3 +0,0 @@\n-LIMIT = 3\n-def gone():\n-    return LIMIT\n"
+
+    summary = summarize_python_change(PrFile("app.py", diff, status="removed"), "")
+
+    assert summary == [
+        "    - removed function `gone()`",
+        "    ~ module-level changes",
+        "      -LIMIT = 3",
+    ]
+
+
+def test_added_file_lists_added_symbols():
+    diff = "@@ -0,0 +1,2 @@\n+def new():\n+    return 1\n"
+
+    summary = summarize_python_change(PrFile("app.py", diff, status="added"), "def new():\n    return 1\n")
+
+    assert summary == ["    + added function `new()` (line 1)"]
@@ -0,0 +1,115 @@
+"""Unit tests for the deterministic, LLM-free checklist."""
+
+from pr_inspector.services.blob_store import BlobStore
+from pr_inspector.services.github_service import PrDetails, PrFile
+from pr_inspector.tools.checklist.fast_checklist import (
+    _build_dependency_graph,
+    _find_risks,
+    _match_tests,
+    _order_files,
+    build_fast_checklist,
+    fast_checklist_digest,
+)
+
+
+def _pr_file(file_name: str, file_diff: str | None = "", **kwargs) -> PrFile:
+    return PrFile(file_name, file_diff, **kwargs)
+
+
+def test_dependency_graph_resolves_relative_imports_from_source(tmp_path):
+    store = BlobStore(str(tmp_path), max_bytes=1024 * 1024)
+    store.put("views", b"from . import models\nfrom ..core.utils import helper\n")
+    pr_files = [
+        _pr_file("app/web/views.py", blob_sha="views"),
+        _pr_file("app/web/models.py"),
+        _pr_file("app/core/utils.py"),
+    ]
+
+    dependencies = _build_dependency_graph(pr_files, store)
+
+    assert dependencies["app/web/views.py"] == {"app/web/models.py", "app/core/utils.py"}
+
+
+def test_dependency_graph_falls_back_to_patch_imports_and_strips_src():
+    pr_files = [
+        _pr_file("src/pkg/api.py", "@@ -1 +1,2 @@\n+from pkg.service import run\n import os\n"),
+        _pr_file("src/pkg/service.py"),
+        # Removed import lines don't count.
+        _pr_file("src/pkg/cli.py", "@@ -1 +1 @@\n-import pkg.api\n+import sys\n"),
+    ]
+
+    dependencies = _build_dependency_graph(pr_files, None)
+
+    assert dependencies == {
+        "src/pkg/api.py": {"src/pkg/service.py"},
+        "src/pkg/service.py": set(),
+        "src/pkg/cli.py": set(),
+    }
+
+
+def test_order_files_puts_dependencies_first_and_tests_last():
+    pr_files = [_pr_file(name) for name in ["tests/test_api.py", "pkg/api.py", "pkg/models.py", "config.yaml"]]
+    dependencies = {
+        "tests/test_api.py": {"pkg/api.py"},
+        "pkg/api.py": {"pkg/models.py"},
+        "pkg/models.py": set(),
+        "config.yaml": set(),
+    }
+
+    assert _order_files(pr_files, dependencies) == ["config.yaml", "pkg/models.py", "pkg/api.py", "tests/test_api.py"]
+
+
+def test_order_files_breaks_cycles_by_path_rank():
+    pr_files = [_pr_file("pkg/api.py"), _pr_file("pkg/models.py")]
+    dependencies = {"pkg/api.py": {"pkg/models.py"}, "pkg/models.py": {"pkg/api.py"}}
+
+    assert _order_files(pr_files, dependencies) == ["pkg/models.py", "pkg/api.py"]
+
+
+def test_match_tests_by_module_name():
+    source_files = [_pr_file("pkg/parser.py"), _pr_file("pkg/lexer.py")]
+    test_files = [_pr_file("tests/test_parser.py"), _pr_file("pkg/parser_test.py"), _pr_file("web/other.test.ts")]
+
+    assert _match_tests(source_files, test_files) == {
+        "pkg/parser.py": ["tests/test_parser.py", "pkg/parser_test.py"],
+        "pkg/lexer.py": [],
+    }
+
+
+def test_security_rule_matches_whole_path_words_only():
+    pr_files = [
+        _pr_file(name)
+        for name in [
+            "AUTHORS.md", "nlp/tokenizer.py", "docs/cryptography_history.md",
+            "app/auth/views.py", "app/login.py", "api/access_token.py", "Secrets.yaml",
+        ]
+    ]
+
+    risks = {risk.category: risk for risk in _find_risks(pr_files).risks}
+
+    assert risks["security"].affected_areas == ["app/auth/views.py", "app/login.py", "api/access_token.py", "Secrets.yaml"]
+
+
+def test_risks_flag_migrations_dependencies_and_deleted_tests():
+    pr_files = [
+        _pr_file("app/migrations/0002_add_field.py"),
+        _pr_file("pyproject.toml"),
+        _pr_file("tests/test_old.py", status="removed"),
+    ]
+
+    descriptions = [risk.description for risk in _find_risks(pr_files).risks]
+
+    assert descriptions[0].startswith("Database migration changed")
+    assert any(description.startswith("Dependency manifest changed") for description in descriptions)
+    assert descriptions[-1].startswith("Tests were deleted")
+
+
+def test_digest_is_capped():
+    pr_details = PrDetails("org", "repo", 1, "title", "", [_pr_file(f"pkg/module_{index}.py") for index in range(100)])
+    checklist = build_fast_checklist(pr_details)
+
+    digest = fast_checklist_digest(checklist, max_chars=500)
+
+    assert len(digest) <= 500 + len("  ... (100 more lines omitted)")
+    assert digest.endswith("more lines omitted)")
+    assert "pkg/module_0.py" in digest
@@ -0,0 +1,132 @@
+"""Unit tests for checklist generation and its fallbacks."""
+
+import base64
+from types import SimpleNamespace
+
+import litellm
+
+from pr_inspector.services.blob_store import BlobStore
+from pr_inspector.services.github_service import GithubService, PrDetails, PrFile
+from pr_inspector.services.llm_service import CircuitBreaker, LLMUnavailableError
+from pr_inspector.tools.checklist.fast_checklist import build_fast_checklist
+from pr_inspector.tools.checklist.store import ChecklistStore
+from pr_inspector.tools.checklist.tool import (
+    DEGRADED_NOTICE,
+    _create_pr_checklist_impl,
+    create_pr_checklist,
+    transform_response_to_markdown,
+)
+
+PR_URL = "https://github.com/org/repo/pull/1"
+SOURCE = b"def handler(request):\n    return request\n"
+PATCH = "@@ -1,2 +1,2 @@\n def handler(request):\n-    return None\n+    return request\n"
+
+# Stands in for what the LLM generates: any valid checklist will do.
+LLM_OUTPUT = build_fast_checklist(
+    PrDetails("org", "repo", 1, "LLM", "", [PrFile("llm/generated.py", PATCH, status="modified")])
+)
+
+
+class FakeRepo:
+    def __init__(self):
+        self.blob_fetches = 0
+
+    def get_pull(self, pr_number):
+        files = [SimpleNamespace(filename="app/handlers.py", patch=PATCH, sha="blob1", status="modified")]
+        return SimpleNamespace(title="Title", body="Body", head=SimpleNamespace(sha="head1"), get_files=lambda: files)
+
+    def get_git_blob(self, blob_sha):
+        self.blob_fetches += 1
+        return SimpleNamespace(encoding="base64", content=base64.b64encode(SOURCE).decode())
+
+
+class FakeLLMService:
+    """Returns LLM_OUTPUT section by section, failing the sections in `failing`."""
+
+    def __init__(self, failing: set[str] = frozenset()):
+        self.failing = failing
+        self.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_seconds=60)
+        self.calls = 0
+
+    def request_section(self, messages, response_format, field_name, model):
+        self.calls += 1
+        if field_name in self.failing:
+            raise litellm.exceptions.Timeout("slow", model=model, llm_provider="openai")
+        return getattr(LLM_OUTPUT, field_name)
+
+    def structured_completion(self, messages, response_format, model):
+        self.calls += 1
+        if self.failing:
+            raise LLMUnavailableError("open")
+        return LLM_OUTPUT
+
+
+def _github_service(tmp_path) -> GithubService:
+    github_service = GithubService(blob_store=BlobStore(str(tmp_path), max_bytes=1024 * 1024))
+    github_service._repos["org/repo"] = FakeRepo()
+    return github_service
+
+
+def test_checklist_is_stored_when_every_section_succeeds(tmp_path):
+    store = ChecklistStore()
+
+    markdown = _create_pr_checklist_impl(
+        PR_URL, _github_service(tmp_path), FakeLLMService(), mode="sectional", checklist_store=store
+    )
+
+    assert markdown == transform_response_to_markdown(LLM_OUTPUT)
+    assert store.get("org", "repo", 1, "head1") == markdown
+
+
+def test_partially_degraded_checklist_names_sections_and_is_not_stored(tmp_path):
+    store = ChecklistStore()
+
+    markdown = _create_pr_checklist_impl(
+        PR_URL,
+        _github_service(tmp_path),
+        FakeLLMService(failing={"per_file_notes", "context"}),
+        mode="sectional",
+        checklist_store=store,
+    )
+
+    assert markdown.startswith("> **Note:** The LLM provider failed to generate some sections")
+    assert "Per-File Notes, Context." in markdown.splitlines()[0]
+    assert "app/handlers.py" in markdown
+    assert store.get("org", "repo", 1, "head1") is None
+
+
+def test_fully_degraded_checklist_is_not_stored(tmp_path):
+    store = ChecklistStore()
+
+    markdown = _create_pr_checklist_impl(
+        PR_URL, _github_service(tmp_path), FakeLLMService(failing={"any"}), mode="single", checklist_store=store
+    )
+
+    assert markdown.startswith(DEGRADED_NOTICE)
+    assert store.get("org", "repo", 1, "head1") is None
+
+
+def test_open_breaker_skips_llm_preparation(tmp_path):
+    github_service = _github_service(tmp_path)
+    llm_service = FakeLLMService()
+    llm_service.circuit_breaker.record_failure()
+
+    markdown = _create_pr_checklist_impl(PR_URL, github_service, llm_service, mode="sectional")
+
+    assert markdown.startswith(DEGRADED_NOTICE)
+    assert llm_service.calls == 0
+    assert github_service._repos["org/repo"].blob_fetches == 0
+
+
+def test_unknown_priority_is_rejected_before_admission():
+    result = create_pr_checklist(
+        PR_URL,
+        priority="urgent",
+        github_service=None,
+        llm_service=None,
+        repo_profile_service=None,
+        checklist_store=None,
+        admission_controller=None,
+    )
+
+    assert result == "Unknown priority 'urgent'. Expected one of: interactive, batch, prefetch."